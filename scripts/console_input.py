@@ -0,0 +1,75 @@
+"""
+Espera de teclado en la consola de Windows sin sondear kbhit().
+
+WaitForSingleObject sobre el handle de entrada despierta con cualquier evento
+de consola (foco, mouse, key-up, resize), no solo con teclas. Esos eventos se
+descartan uno a uno mirando el frente de la cola con PeekConsoleInput, en vez
+de vaciarla con FlushConsoleInputBuffer, que también se llevaría una tecla
+que llegue justo después del último kbhit().
+"""
+import time
+
+try:
+    import msvcrt
+    import ctypes
+    from ctypes import wintypes
+    WINDOWS_CONSOLE = True
+except ImportError:
+    WINDOWS_CONSOLE = False
+
+STD_INPUT_HANDLE = -10
+KEY_EVENT = 0x0001
+WAIT_OBJECT_0 = 0
+
+if WINDOWS_CONSOLE:
+    class _KEY_EVENT_RECORD(ctypes.Structure):
+        _fields_ = [
+            ("bKeyDown", wintypes.BOOL),
+            ("wRepeatCount", wintypes.WORD),
+            ("wVirtualKeyCode", wintypes.WORD),
+            ("wVirtualScanCode", wintypes.WORD),
+            ("UnicodeChar", wintypes.WCHAR),
+            ("dwControlKeyState", wintypes.DWORD),
+        ]
+
+    class _INPUT_RECORD(ctypes.Structure):
+        # el union Event mide lo mismo que KEY_EVENT_RECORD (16 bytes): basta ese miembro
+        _fields_ = [("EventType", wintypes.WORD), ("KeyEvent", _KEY_EVENT_RECORD)]
+
+    _kernel32 = ctypes.windll.kernel32
+    _stdin_handle = None
+
+
+def _drop_non_key_events(handle) -> bool:
+    """Descartar eventos del frente de la cola hasta una tecla con carácter; True si quedó una"""
+    rec = _INPUT_RECORD()
+    n = wintypes.DWORD()
+    while _kernel32.PeekConsoleInputW(handle, ctypes.byref(rec), 1, ctypes.byref(n)) and n.value:
+        key = rec.KeyEvent
+        if rec.EventType == KEY_EVENT and key.bKeyDown and key.UnicodeChar != "\x00":
+            return True
+        _kernel32.ReadConsoleInputW(handle, ctypes.byref(rec), 1, ctypes.byref(n))
+    return False
+
+
+def wait_for_key(timeout: float) -> bool:
+    """
+    Dormir hasta `timeout` segundos a que haya una tecla lista para msvcrt.getwch().
+
+    Returns: True si hay tecla, False si venció el timeout.
+    """
+    global _stdin_handle
+    if msvcrt.kbhit():
+        return True
+    if _stdin_handle is None:
+        _stdin_handle = _kernel32.GetStdHandle(STD_INPUT_HANDLE)
+
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            return False
+        if _kernel32.WaitForSingleObject(_stdin_handle, remaining_ms) != WAIT_OBJECT_0:
+            return False
+        if _drop_non_key_events(_stdin_handle):
+            return True
@@ -223,6 +223,7 @@ class MotorImageryDataAcquisition:
         
         final_response = self.survey.ask_final_survey()
         self.survey.save_survey_response(self.initial_response, final_response)
+        self.survey.close()
         
         print("\n===== Post-session survey COMPLETED ======\n")
         time.sleep(1)
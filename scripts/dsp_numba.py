@@ -0,0 +1,79 @@
+"""
+Filtrado IIR en tiempo real (cascada de biquads / SOS) para los loops de adquisición.
+
+El filtro guarda su estado entre chunks, así que un chunk de ~25 muestras se
+filtra igual que si la señal completa pasara de una vez. Con numba instalado
+la cascada corre compilada y sin el GIL (nogil), así el hilo de adquisición
+no frena al de la UI mientras filtra; sin numba se usa scipy.signal.sosfilt
+con el mismo formato de estado.
+"""
+import numpy as np
+from scipy.signal import sosfilt
+
+# Optional Numba JIT
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _sosfilt_loop(sos, x, zi, out):
+    """
+    Cascada de biquads (forma directa II transpuesta, como scipy) sobre x (n, n_ch).
+
+    sos: (n_sections, 6); zi: (n_sections, 2, n_ch), se actualiza in-place;
+    out: (n, n_ch) float64 o float32 (el cálculo siempre va en float64).
+    """
+    n, n_ch = x.shape
+    n_sections = sos.shape[0]
+    for c in range(n_ch):
+        for i in range(n):
+            v = x[i, c]
+            for s in range(n_sections):
+                y = sos[s, 0] * v + zi[s, 0, c]
+                zi[s, 0, c] = sos[s, 1] * v - sos[s, 4] * y + zi[s, 1, c]
+                zi[s, 1, c] = sos[s, 2] * v - sos[s, 5] * y
+                v = y
+            out[i, c] = v
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _sosfilt_kernel = njit(cache=True, fastmath=True, nogil=True)(_sosfilt_loop)
+
+
+def make_sos_state(sos: np.ndarray, n_ch: int) -> np.ndarray:
+    """Estado inicial (ceros) de la cascada para n_ch canales"""
+    return np.zeros((sos.shape[0], 2, n_ch), dtype=np.float64)
+
+
+def sosfilt_nb(sos: np.ndarray, x: np.ndarray, zi: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Filtrar un chunk x (n, n_ch) con estado persistente zi (se actualiza in-place).
+
+    Returns: chunk filtrado (n, n_ch) float64, o en `out` si se pasa
+    (p. ej. float32 para escribirlo directo al buffer del plot).
+    """
+    if out is None:
+        out = np.empty(x.shape, dtype=np.float64)
+
+    if NUMBA_AVAILABLE:
+        return _sosfilt_kernel(sos, x, zi, out)
+
+    y, zf = sosfilt(sos, x, axis=0, zi=zi)
+    zi[...] = zf
+    out[...] = y
+    return out
+
+
+def warmup_sosfilt(sos: np.ndarray, x: np.ndarray, out: np.ndarray):
+    """
+    Compilar el kernel antes del primer chunk real (no-op sin numba).
+
+    x / out: los buffers que se van a filtrar (p. ej. la vista de columnas del
+    buffer de pull), para que numba especialice con su dtype y layout exactos;
+    x solo se lee y out se sobreescribe.
+    """
+    if NUMBA_AVAILABLE:
+        sosfilt_nb(sos, x[:8], make_sos_state(sos, x.shape[1]), out=out[:8])
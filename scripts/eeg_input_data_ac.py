@@ -45,6 +45,7 @@ DATA_ROOT.mkdir(parents=True, exist_ok=True)
 # Platform-specific keyboard input handling // in case @lalo or @dani are using this piece of code on Windows.
 try:
     import msvcrt  # Windows
+    from console_input import wait_for_key
     PLATFORM = 'windows'
 except ImportError:
     try:
@@ -88,9 +89,10 @@ class KeyboardInputHandler:
             str: The pressed key or None if no key pressed
         """
         if self.platform == 'windows':
-            if msvcrt.kbhit():
-                return msvcrt.getch().decode('utf-8')
-            return None
+            # Sleep on the console input handle instead of spinning on kbhit()
+            if not wait_for_key(timeout):
+                return None
+            return msvcrt.getwch()
             
         elif self.platform == 'unix':
             import sys, select
@@ -1,8 +1,17 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from typing import Optional
 
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 
 class BrainPlotter:
     """
@@ -21,14 +30,43 @@ class BrainPlotter:
         self.sampling_rate = 256  # Muse 2 default
         
         # TODO: Extract timestamp data and convert to numpy array
+    
+    @classmethod
+    def from_arrow(cls, path) -> "BrainPlotter":
+        """
+        Load a session recorded as an Arrow IPC stream (labeled_data.arrow).
+        
+        Args:
+            path: Path to the .arrow file written by the facial artifact recorder
+        """
+        if not ARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to read .arrow sessions. Install with: pip install pyarrow")
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_stream(source).read_all()
+        return cls(table.to_pandas())
+    
+    @staticmethod
+    def _new_figure(figsize, interactive: bool = True) -> Figure:
+        """
+        Create a figure, through pyplot only when it will be shown.
+        
+        Non-interactive figures are bound to an Agg canvas directly, skipping
+        the pyplot figure manager and GUI backend.
+        """
+        if interactive:
+            return plt.figure(figsize=figsize)
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig
         
-    def plotchannel(self, channel: str, seconds: float, title: Optional[str]=None):
+    def plotchannel(self, channel: str, seconds: float, title: Optional[str]=None, interactive: bool = True):
         """
         Plot a specific channel for a given duration.
         
         Args:
             channel: Channel name ('TP9', 'AF7', 'AF8', 'TP10')
             seconds: Duration to plot in seconds
+            interactive: If False, build the figure without pyplot and don't show it
         """
         # TODO: Extract channel data for the specified duration
         data_time = np.arange(len(self.df)) / self.sampling_rate
@@ -36,22 +74,25 @@ class BrainPlotter:
         time_x = data_time[:duration]
         signal = self.df[channel][:duration]
         # TODO: Plot using matplotlib
-        fig = plt.figure(figsize=(10, 4))
-        plt.plot(time_x, signal)
-        plt.legend()
-        plt.title(f'Signal {title} Channel: {channel} for {seconds} seconds')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Amplitude (µV)')
-        plt.grid()
-        plt.ylim(-600, 600)
-        plt.show()
+        fig = self._new_figure((10, 4), interactive)
+        ax = fig.add_subplot(111)
+        ax.plot(time_x, signal)
+        ax.legend()
+        ax.set_title(f'Signal {title} Channel: {channel} for {seconds} seconds')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Amplitude (µV)')
+        ax.grid()
+        ax.set_ylim(-600, 600)
+        if interactive:
+            plt.show()
 
         return fig # Return the plot object for further use if needed
     
-    def plot_multiple_channels(self, channels: [], seconds: float, title: Optional[str]=None):
+    def plot_multiple_channels(self, channels: [], seconds: float, title: Optional[str]=None, interactive: bool = True):
         
         offset = 300
-        fig = plt.figure(figsize=(10,4))
+        fig = self._new_figure((10, 4), interactive)
+        ax = fig.add_subplot(111)
 
         data_time = np.arange(len(self.df)) / self.sampling_rate
         duration = int(self.sampling_rate * seconds)
@@ -69,19 +110,20 @@ class BrainPlotter:
         for i, ch in enumerate(channels):
             signal = self.df[ch].values
             signal_points = signal[:duration]
-            plt.plot(time_x, signal_points + i * offset, label=ch, color=channel_colors[ch])
+            ax.plot(time_x, signal_points + i * offset, label=ch, color=channel_colors[ch])
         
-        plt.title(f'Signal {title}, Channels: {", ".join(channels)} for {seconds} seconds')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Amplitude (µV)')
-        plt.grid()
-        plt.legend(loc='upper right')
-        plt.ylim(-600, offset * len(channels))
-        plt.show()
+        ax.set_title(f'Signal {title}, Channels: {", ".join(channels)} for {seconds} seconds')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Amplitude (µV)')
+        ax.grid()
+        ax.legend(loc='upper right')
+        ax.set_ylim(-600, offset * len(channels))
+        if interactive:
+            plt.show()
 
         return fig # Return the plot object for further use if needed
     
-    def compare_plots(self, df_1, df_2, channel: str, seconds: float, plot_type: str = 'overlap', title: Optional[str]=None, df_1_alias:Optional[str]=None,df_2_alias:Optional[str]=None):
+    def compare_plots(self, df_1, df_2, channel: str, seconds: float, plot_type: str = 'overlap', title: Optional[str]=None, df_1_alias:Optional[str]=None,df_2_alias:Optional[str]=None, interactive: bool = True):
             """
             Compare the same channel from two different DataFrames over a specified duration.
             Args:
@@ -90,32 +132,37 @@ class BrainPlotter:
                 channel: Channel name to compare ('TP9', 'AF7', 'AF8', 'TP10')
                 seconds: Duration to plot in seconds
                 plot_type: Type of comparison plot - 'overlap' or 'sidetoside' (default: 'overlap')
+                interactive: If False, build the figure without pyplot and don't show it
             """
             
             data_time = np.arange(len(df_1)) / self.sampling_rate
             duration = int(self.sampling_rate * seconds)
             time_x = data_time[:duration]
             
-            signal_1 = df_1[channel][:duration]
-            signal_2 = df_2[channel][:duration]
+            signal_1 = df_1[channel].to_numpy(copy=False)[:duration]
+            signal_2 = df_2[channel].to_numpy(copy=False)[:duration]
         
-            global_ymin = min(signal_1.min(), signal_2.min())
-            global_ymax = max(signal_1.max(), signal_2.max())
+            stacked = np.concatenate([signal_1, signal_2])
+            # nan-aware, like the pandas min/max this replaced
+            global_ymin, global_ymax = np.nanmin(stacked), np.nanmax(stacked)
             
             if plot_type == 'overlap':
-                fig = plt.figure(figsize=(10, 4))
-                plt.plot(time_x, signal_1, label={df_1_alias}, color='cyan')
-                plt.plot(time_x, signal_2, label={df_2_alias}, color='purple', alpha=0.7)
-                plt.title(f'Comparison of {title} EEG Channel: {channel} for {seconds} seconds')
-                plt.xlabel('Time (s)')
-                plt.ylabel('Amplitude (µV)')
-                plt.grid()
-                plt.legend()
-                plt.ylim(global_ymin, global_ymax)
-                plt.show()
+                fig = self._new_figure((10, 4), interactive)
+                ax = fig.add_subplot(111)
+                ax.plot(time_x, signal_1, label={df_1_alias}, color='cyan')
+                ax.plot(time_x, signal_2, label={df_2_alias}, color='purple', alpha=0.7)
+                ax.set_title(f'Comparison of {title} EEG Channel: {channel} for {seconds} seconds')
+                ax.set_xlabel('Time (s)')
+                ax.set_ylabel('Amplitude (µV)')
+                ax.grid()
+                ax.legend()
+                ax.set_ylim(global_ymin, global_ymax)
+                if interactive:
+                    plt.show()
             
             elif plot_type == 'sidetoside':
-                fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
+                fig = self._new_figure((10, 8), interactive)
+                ax1, ax2 = fig.subplots(2, 1, sharex=True)
                 
                 # Top subplot - Trial 1
                 ax1.plot(time_x, signal_1, label='Rest', color='cyan')
@@ -135,8 +182,9 @@ class BrainPlotter:
                 ax2.set_ylim(global_ymin, global_ymax)
                 
                 fig.suptitle(f'Comparison of{title} EEG Channel: {channel} for {seconds} seconds', fontsize=14, y=0.995)
-                plt.tight_layout()
-                plt.show()
+                fig.tight_layout()
+                if interactive:
+                    plt.show()
             
             else:
                 raise ValueError(f"Invalid plot_type: '{plot_type}'. Must be 'overlap' or 'sidetoside'.")
@@ -14,18 +14,19 @@ Características:
 - Auto-guardado continuo de datos
 """
 
+import os
 import sys
 import time
 import json
 import threading
+import queue
 import subprocess
 import atexit
 from pathlib import Path
-from collections import deque
 from dataclasses import dataclass
 
 import numpy as np
-from pylsl import StreamInlet, resolve_streams
+from pylsl import StreamInlet, resolve_streams, local_clock
 import dearpygui.dearpygui as dpg
 
 try:
@@ -35,6 +36,14 @@ except ImportError:
     AUDIO_AVAILABLE = False
     print("⚠️  pyttsx3 not available. Install with: pip install pyttsx3")
 
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+    print("⚠️  pyarrow not available, sessions will be saved as CSV. Install with: pip install pyarrow")
+
 # =========================
 # CONFIG
 # =========================
@@ -58,6 +67,31 @@ ACTIONS = [
     ("LEVANTAR_CEJAS", "Levante las cejas hacia arriba y abajo"),
 ]
 
+# Label names and their index (event counters, Arrow dictionary codes)
+LABELS = [name for name, _ in ACTIONS]
+LABEL_IDX = {name: i for i, name in enumerate(LABELS)}
+
+# Big spaced-out text shown for each trial state (built once, not per UI frame)
+ACTION_DISPLAY = {
+    a: "    " + "   ".join(a) + "    "
+    for a in ["PAUSADO", "PREPÁRESE", "TERMINADO"] + LABELS
+}
+
+# Spoken cues
+ACTION_MESSAGES = {
+    "REPOSO": "Reposo. Relájese y respire normalmente.",
+    "PARPADEO_DERECHO": "Parpadeo ojo derecho. Parpadee con el ojo derecho varias veces.",
+    "PARPADEO_IZQUIERDO": "Parpadeo ojo izquierdo. Parpadee con el ojo izquierdo varias veces.",
+    "LEVANTAR_CEJAS": "Levantar cejas. Levante las cejas hacia arriba y abajo.",
+}
+
+LABEL_SPANISH = {
+    "PARPADEO_DERECHO": "Parpadeo derecho",
+    "PARPADEO_IZQUIERDO": "Parpadeo izquierdo",
+    "LEVANTAR_CEJAS": "Levantar cejas",
+    "REPOSO": "Reposo",
+}
+
 # Keyboard shortcuts
 KEYS_MAP = {
     dpg.mvKey_D: "PARPADEO_DERECHO",
@@ -66,6 +100,22 @@ KEYS_MAP = {
     dpg.mvKey_Spacebar: "REPOSO",
 }
 
+# Thread placement for the latency-critical threads (best effort)
+STREAM_THREAD_CPU = 1
+TRIAL_THREAD_CPU = 2
+
+# Fonts and theme (large, clear UI for elderly users)
+FONT_PATH = Path("./fonts/default.ttf")
+FONT_AVAILABLE = FONT_PATH.exists()
+THEME_STYLES = {
+    dpg.mvStyleVar_WindowPadding: (24, 24),
+    dpg.mvStyleVar_FramePadding: (16, 12),
+    dpg.mvStyleVar_ItemSpacing: (16, 16),
+    dpg.mvStyleVar_FrameRounding: (12,),
+    dpg.mvStyleVar_WindowRounding: (16,),
+    dpg.mvStyleVar_GrabRounding: (12,),
+}
+
 # Data storage
 DATA_DIR = Path("./facial_artifact_datasets")
 FLUSH_EVERY_S = 2.0
@@ -73,6 +123,19 @@ FLUSH_EVERY_S = 2.0
 # Ring buffer
 RING_BUFFER_SECONDS = 10.0
 
+# Live plot: last PLOT_WINDOW_S seconds, decimated to at most PLOT_POINTS points
+PLOT_WINDOW_S = 5.0
+PLOT_POINTS = 500
+
+# Arrow session schema (label stored as a dictionary code over the action names)
+if ARROW_AVAILABLE:
+    ARROW_LABELS = pa.array(LABELS, type=pa.string())
+    ARROW_SCHEMA = pa.schema(
+        [("label", pa.dictionary(pa.int8(), pa.string())), ("t_lsl", pa.float64())]
+        + [(name, pa.float32()) for name in CHANNEL_NAMES]
+        + [("t_event", pa.float64())]
+    )
+
 # =========================
 # Helpers
 # =========================
@@ -82,6 +145,52 @@ def now_str():
 def safe_mkdir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
+def pin_current_thread(cpu: int):
+    """
+    Pin the calling thread to one CPU and raise its priority (best effort).
+    
+    Doesn't help GIL contention, but keeps the thread from being preempted by
+    render work, which reduces wake-up latency and label jitter. Silently does
+    nothing where unsupported (macOS) or not permitted.
+    """
+    try:
+        if hasattr(os, "sched_setaffinity"):  # Linux: pid 0 = calling thread
+            allowed = sorted(os.sched_getaffinity(0))
+            if len(allowed) <= 1:
+                return
+            os.sched_setaffinity(0, {allowed[cpu % len(allowed)]})
+            os.nice(-5)
+        elif sys.platform == "win32":
+            n_cpus = os.cpu_count() or 1
+            if n_cpus <= 1:
+                return
+            cpu = cpu % n_cpus
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            THREAD_PRIORITY_TIME_CRITICAL = 15
+            handle = kernel32.GetCurrentThread()
+            kernel32.SetThreadAffinityMask(handle, 1 << cpu)
+            kernel32.SetThreadPriority(handle, THREAD_PRIORITY_TIME_CRITICAL)
+    except (OSError, AttributeError):
+        pass
+
+def setup_fonts_and_theme():
+    """Register the large fonts and bind the global theme (needs a dpg context)"""
+    large_font = huge_font = None
+    with dpg.font_registry():
+        # Default font but MUCH larger
+        if FONT_AVAILABLE:
+            large_font = dpg.add_font(str(FONT_PATH), 32, default_font=False)
+            huge_font = dpg.add_font(str(FONT_PATH), 48, default_font=False)
+    
+    with dpg.theme() as global_theme:
+        with dpg.theme_component(dpg.mvAll):
+            for style, values in THEME_STYLES.items():
+                dpg.add_theme_style(style, *values)
+    
+    dpg.bind_theme(global_theme)
+    return large_font, huge_font
+
 def resolve_eeg_inlet(timeout_s=STREAM_SEARCH_TIMEOUT_S) -> StreamInlet:
     """Find and connect to Muse EEG stream"""
     print(f"🔍 Buscando stream EEG (timeout: {timeout_s}s)...")
@@ -96,6 +205,31 @@ def resolve_eeg_inlet(timeout_s=STREAM_SEARCH_TIMEOUT_S) -> StreamInlet:
                 return StreamInlet(s, max_buflen=60)
     raise RuntimeError("❌ No se encontró stream LSL EEG.")
 
+class BatchedUI:
+    """Collect dpg.set_value calls and apply them together on exit.
+    
+    Repeated writes to the same item keep only the last value, and the flush
+    runs under dpg.mutex() so all changes land in the same rendered frame.
+    """
+    
+    def __init__(self):
+        self.pending = {}
+    
+    def set(self, item, value):
+        self.pending[item] = value
+    
+    def __enter__(self):
+        self.pending.clear()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.pending:
+            with dpg.mutex():
+                for item, value in self.pending.items():
+                    dpg.set_value(item, value)
+            self.pending.clear()
+        return False
+
 # =========================
 # Audio Cue Manager
 # =========================
@@ -105,7 +239,7 @@ class AudioCueManager:
     def __init__(self):
         self.enabled = AUDIO_AVAILABLE
         self.engine = None
-        self.lock = threading.Lock()
+        self._q: queue.Queue = queue.Queue()  # (text, priority)
         
         if self.enabled:
             try:
@@ -144,37 +278,51 @@ class AudioCueManager:
             except Exception as e:
                 print(f"⚠️  Error de inicialización de audio: {e}")
                 self.enabled = False
+        
+        # Single speech worker; callers only enqueue text
+        if self.enabled:
+            threading.Thread(target=self._speech_worker, daemon=True).start()
     
-    def speak(self, text: str):
-        """Speak text asynchronously"""
+    def _speech_worker(self):
+        """Speak queued texts one at a time"""
+        while True:
+            text, _ = self._q.get()
+            try:
+                self.engine.say(text)
+                self.engine.runAndWait()
+            except Exception as e:
+                print(f"⚠️  Audio error: {e}")
+    
+    def speak(self, text: str, priority: bool = False):
+        """Speak text asynchronously
+        
+        priority=True drops earlier priority cues still waiting in the queue
+        (stale countdown numbers), so a time-critical cue is not delayed behind
+        them; other pending cues (e.g. "Prepárese") are kept in order.
+        """
         if not self.enabled:
             return
         
-        def _speak():
-            with self.lock:
+        if priority:
+            pending = []
+            while True:
                 try:
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                except Exception as e:
-                    print(f"⚠️  Audio error: {e}")
-        
-        threading.Thread(target=_speak, daemon=True).start()
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if not item[1]:
+                    pending.append(item)
+            for item in pending:
+                self._q.put_nowait(item)
+        self._q.put_nowait((text, priority))
     
     def speak_action(self, action: str):
         """Speak action instruction"""
-        messages = {
-            "REPOSO": "Reposo. Relájese y respire normalmente.",
-            "PARPADEO_DERECHO": "Parpadeo ojo derecho. Parpadee con el ojo derecho varias veces.",
-            "PARPADEO_IZQUIERDO": "Parpadeo ojo izquierdo. Parpadee con el ojo izquierdo varias veces.",
-            "LEVANTAR_CEJAS": "Levantar cejas. Levante las cejas hacia arriba y abajo.",
-        }
-        
-        msg = messages.get(action, action)
-        self.speak(msg)
+        self.speak(ACTION_MESSAGES.get(action, action))
     
     def speak_countdown(self, seconds: int):
         """Speak countdown number"""
-        self.speak(str(seconds))
+        self.speak(str(seconds), priority=True)
     
     def speak_ready(self):
         """Speak 'get ready' message"""
@@ -231,14 +379,28 @@ class EEGRecorder:
         self.inlet: StreamInlet | None = None
         self.fs: float = 256.0
         
-        # Ring buffer for recent data
+        # Ring buffer for recent data: column 0 = t_lsl, columns 1.. = channels
         self.buffer_lock = threading.Lock()
-        self.t_lsl = deque()
-        self.y = [deque() for _ in range(N_CH)]
+        self.ring = np.zeros((0, 1 + N_CH), dtype=np.float64)
+        self.ring_pos = 0
+        self.ring_filled = 0
         
-        # Current state
+        # Preallocated plot buffers, refilled in place by get_plot_data
+        self._plot_idx = np.zeros(PLOT_POINTS, dtype=np.int64)
+        self._plot_offsets = np.zeros(PLOT_POINTS, dtype=np.int64)
+        self._plot_stride = 1
+        self._plot_x = np.zeros(PLOT_POINTS, dtype=np.float64)
+        self._plot_y = np.zeros(PLOT_POINTS, dtype=np.float64)
+        self._plot_span = 0
+        
+        # Current state (single attribute read/write is atomic under the GIL).
+        # label_event is (label, t_event): t_event is the LSL local_clock() time the
+        # label was set, in the same clock domain as t_lsl.
         self.current_label = "REPOSO"
-        self.label_lock = threading.Lock()
+        self.label_event = ("REPOSO", 0.0)
+        self.event_q: queue.SimpleQueue = queue.SimpleQueue()
+        self._events_lock = threading.Lock()  # drained from UI stats thread and stop_recording
+        self.events: list[tuple[str, float]] = []
         
         # Recording state
         self.is_running = False
@@ -248,6 +410,7 @@ class EEGRecorder:
         self.session_id = None
         self.session_dir: Path | None = None
         self.data_file = None
+        self.arrow_writer = None
         self.data_path: Path | None = None
         self.meta_path: Path | None = None
         
@@ -256,13 +419,8 @@ class EEGRecorder:
         self.dropouts = 0
         self.last_flush_time = 0.0
         
-        # Event tracking
-        self.event_counts = {
-            "REPOSO": 0,
-            "PARPADEO_DERECHO": 0,
-            "PARPADEO_IZQUIERDO": 0,
-            "LEVANTAR_CEJAS": 0
-        }
+        # Event tracking (indexed by LABEL_IDX)
+        self.event_counts = [0] * len(LABELS)
     
     def connect(self):
         """Connect to EEG stream"""
@@ -273,17 +431,24 @@ class EEGRecorder:
         self.inlet = inlet
         self.fs = fs
         
+        # Preallocated pull buffers (pylsl fills dest_obj in place, no per-chunk lists)
+        self.max_chunk = max(512, int(self.fs // 10))
+        self._scratch = np.empty((self.max_chunk, info.channel_count()), dtype=np.float32)
+        # Per-chunk block shared by the ring buffer and the CSV writer: (t_lsl, TP9..TP10)
+        self._block = np.empty((self.max_chunk, 1 + N_CH), dtype=np.float64)
+        
         # Initialize ring buffer
         maxlen = int(RING_BUFFER_SECONDS * self.fs)
         with self.buffer_lock:
-            self.t_lsl = deque(maxlen=maxlen)
-            self.y = [deque(maxlen=maxlen) for _ in range(N_CH)]
+            self.ring = np.zeros((maxlen, 1 + N_CH), dtype=np.float64)
+            self.ring_pos = 0
+            self.ring_filled = 0
             
-            # Prefill with zeros
-            for _ in range(int(self.fs)):
-                self.t_lsl.append(0.0)
-                for ch in range(N_CH):
-                    self.y[ch].append(0.0)
+            # Plot window in samples; decimated points sit at these offsets
+            # back from the newest sample (descending, so oldest comes first)
+            self._plot_span = min(int(PLOT_WINDOW_S * self.fs), maxlen)
+            self._plot_stride = max(1, -(-self._plot_span // PLOT_POINTS))
+            self._plot_offsets[:] = np.arange(PLOT_POINTS - 1, -1, -1) * self._plot_stride
         
         print(f"✅ EEG conectado: fs={fs:.1f} Hz")
         return fs
@@ -297,53 +462,111 @@ class EEGRecorder:
     
     def _acq_loop(self):
         """Background loop to continuously pull EEG data"""
+        pin_current_thread(STREAM_THREAD_CPU)
         while self.is_running:
             try:
-                chunk, ts = self.inlet.pull_chunk(
+                _, ts_list = self.inlet.pull_chunk(
                     timeout=1, 
-                    max_samples=max(512, int(self.fs // 10))
+                    max_samples=self.max_chunk,
+                    dest_obj=self._scratch
                 )
             except Exception:
                 self.dropouts += 1
                 continue
             
-            if ts and chunk:
-                chunk = np.asarray(chunk, dtype=np.float32)
-                ts = np.asarray(ts, dtype=np.float64)
-                
-                if chunk.shape[1] < N_CH:
+            n = len(ts_list)
+            if n:
+                if self._scratch.shape[1] < N_CH:
                     self.dropouts += 1
                     continue
                 
-                # Add to ring buffer
+                # Build one block per chunk, then feed ring buffer and file from it
+                blk = self._block[:n]
+                blk[:, 0] = ts_list
+                blk[:, 1:] = self._scratch[:n, :N_CH]
+                
                 with self.buffer_lock:
-                    for k in range(len(ts)):
-                        self.t_lsl.append(float(ts[k]))
-                        for ch in range(N_CH):
-                            self.y[ch].append(float(chunk[k, ch]))
+                    self._ring_write(blk)
                 
-                self.samples_total += len(ts)
+                self.samples_total += n
                 
                 # Write to file if recording
                 if self.is_recording:
-                    self._write_data(ts, chunk[:, :N_CH])
+                    label, t_event = self.label_event
+                    if self.arrow_writer is not None:
+                        self.arrow_writer.write_batch(self._arrow_batch(label, t_event, blk, self._scratch[:n]))
+                    else:
+                        np.savetxt(self.data_file, blk, fmt=f"{label},%.6f,%.6f,%.6f,%.6f,%.6f,{t_event:.6f}")
+                    
+                    # Periodic flush
+                    now = time.time()
+                    if now - self.last_flush_time >= FLUSH_EVERY_S:
+                        self.last_flush_time = now
+                        try:
+                            self.data_file.flush()
+                        except Exception:
+                            pass
+    
+    def _arrow_batch(self, label: str, t_event: float, blk: np.ndarray, samples: np.ndarray):
+        """Build one Arrow record batch for a chunk (label codes + t_lsl + float32 channels + t_event)"""
+        n = len(blk)
+        codes = pa.array(np.full(n, LABEL_IDX[label], dtype=np.int8))
+        columns = [
+            pa.DictionaryArray.from_arrays(codes, ARROW_LABELS),
+            pa.array(blk[:, 0]),
+        ]
+        columns += [pa.array(samples[:, ch]) for ch in range(N_CH)]
+        columns.append(pa.array(np.full(n, t_event)))
+        return pa.RecordBatch.from_arrays(columns, schema=ARROW_SCHEMA)
+    
+    def _ring_write(self, blk: np.ndarray):
+        """Copy a (n, 1 + N_CH) block into the ring buffer (caller holds buffer_lock)"""
+        maxlen = len(self.ring)
+        n = min(len(blk), maxlen)
+        blk = blk[len(blk) - n:]
+        
+        end = self.ring_pos + n
+        if end <= maxlen:
+            self.ring[self.ring_pos:end] = blk
+        else:
+            split = maxlen - self.ring_pos
+            self.ring[self.ring_pos:] = blk[:split]
+            self.ring[:end - maxlen] = blk[split:]
+        
+        self.ring_pos = end % maxlen
+        self.ring_filled = min(self.ring_filled + n, maxlen)
     
     def start_recording(self):
         """Start recording session"""
         if self.is_recording:
             return
         
+        # Fresh event log per session: drop label changes made before recording
+        with self._events_lock:
+            while True:
+                try:
+                    self.event_q.get_nowait()
+                except queue.Empty:
+                    break
+            self.events.clear()
+            self.event_counts[:] = [0] * len(LABELS)
+        
         # Create session directory
         safe_mkdir(DATA_DIR)
         self.session_id = f"FACIAL_{now_str()}"
         self.session_dir = DATA_DIR / self.session_id
         safe_mkdir(self.session_dir)
         
-        # Open data file
-        self.data_path = self.session_dir / "labeled_data.csv"
-        self.data_file = open(self.data_path, "w", encoding="utf-8")
-        self.data_file.write("label,t_lsl,TP9,AF7,AF8,TP10\n")
-        self.data_file.flush()
+        # Open data file (Arrow IPC stream when available, CSV otherwise)
+        if ARROW_AVAILABLE:
+            self.data_path = self.session_dir / "labeled_data.arrow"
+            self.data_file = open(self.data_path, "wb")
+            self.arrow_writer = pa.ipc.new_stream(self.data_file, ARROW_SCHEMA)
+        else:
+            self.data_path = self.session_dir / "labeled_data.csv"
+            self.data_file = open(self.data_path, "w", encoding="utf-8")
+            self.data_file.write("label,t_lsl,TP9,AF7,AF8,TP10,t_event\n")
+            self.data_file.flush()
         
         # Save metadata
         self.meta_path = self.session_dir / "meta.json"
@@ -370,8 +593,16 @@ class EEGRecorder:
             return
         
         self.is_recording = False
+        self._drain_events()
         
         # Close data file
+        if self.arrow_writer is not None:
+            try:
+                self.arrow_writer.close()
+            except Exception:
+                pass
+            self.arrow_writer = None
+        
         if self.data_file:
             try:
                 self.data_file.flush()
@@ -392,7 +623,8 @@ class EEGRecorder:
                 "stopped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
                 "samples_total": self.samples_total,
                 "dropouts": self.dropouts,
-                "event_counts": self.event_counts,
+                "event_counts": dict(zip(LABELS, self.event_counts)),
+                "events": self.events,
             })
             
             with open(self.meta_path, "w", encoding="utf-8") as f:
@@ -400,60 +632,65 @@ class EEGRecorder:
         
         print(f"✅ Recording stopped: {self.samples_total} samples")
     
-    def _write_data(self, ts: np.ndarray, data_4ch: np.ndarray):
-        """Write data to file"""
-        with self.label_lock:
-            label = self.current_label
-        
-        for i in range(len(ts)):
-            row = [
-                label,
-                f"{float(ts[i]):.6f}",
-                f"{float(data_4ch[i, 0]):.6f}",
-                f"{float(data_4ch[i, 1]):.6f}",
-                f"{float(data_4ch[i, 2]):.6f}",
-                f"{float(data_4ch[i, 3]):.6f}",
-            ]
-            self.data_file.write(",".join(row) + "\n")
-        
-        # Periodic flush
-        now = time.time()
-        if now - self.last_flush_time >= FLUSH_EVERY_S:
-            self.last_flush_time = now
-            try:
-                self.data_file.flush()
-            except Exception:
-                pass
+    def set_label(self, label: str, t_event: float | None = None):
+        """Change current label
+        
+        Args:
+            label: New label
+            t_event: local_clock() time of the triggering event (e.g. keypress);
+                defaults to now
+        """
+        old_label = self.current_label
+        if label == old_label:
+            return
+        
+        if t_event is None:
+            t_event = local_clock()
+        self.label_event = (label, t_event)
+        self.current_label = label
+        self.event_q.put((label, t_event))
     
-    def set_label(self, label: str):
-        """Change current label"""
-        with self.label_lock:
-            old_label = self.current_label
-            self.current_label = label
-            
-            if label != old_label:
-                self.event_counts[label] = self.event_counts.get(label, 0) + 1
+    def _drain_events(self):
+        """Fold queued label changes into event_counts and events"""
+        with self._events_lock:
+            while True:
+                try:
+                    label, t_event = self.event_q.get_nowait()
+                except queue.Empty:
+                    break
+                self.event_counts[LABEL_IDX[label]] += 1
+                self.events.append((label, t_event))
+    
+    def get_event_counts(self) -> list:
+        """Current event counts (drains pending label changes first)"""
+        self._drain_events()
+        return self.event_counts
     
     def get_plot_data(self, channel_idx: int = 1):
-        """Get recent data for plotting (AF7 by default - frontal)"""
-        with self.buffer_lock:
-            t = np.asarray(self.t_lsl, dtype=np.float64)
-            y = np.asarray(self.y[channel_idx], dtype=np.float32)
+        """Get recent data for plotting (AF7 by default - frontal)
         
-        if len(t) < 2:
-            return np.array([0.0, 1.0]), np.array([0.0, 0.0])
-        
-        # Last 5 seconds
-        t_end = t[-1]
-        t_start = t_end - 5.0
-        m = t >= t_start
-        tt = t[m]
-        yy = y[m]
-        
-        # Make relative
-        if len(tt) > 0:
-            tt = tt - tt[-1]
+        Returns views into preallocated float64 buffers holding the last
+        PLOT_WINDOW_S seconds decimated to at most PLOT_POINTS points; DearPyGui
+        reads them through the buffer protocol. Valid until the next call.
+        """
+        with self.buffer_lock:
+            if self.ring_filled < 2:
+                return np.array([0.0, 1.0]), np.array([0.0, 0.0])
+            
+            maxlen = len(self.ring)
+            span = min(self.ring_filled, self._plot_span)
+            n = min(PLOT_POINTS, (span - 1) // self._plot_stride + 1)
+            
+            # Ring positions of the decimated points (oldest first, newest last)
+            idx = self._plot_idx[:n]
+            np.subtract(self.ring_pos - 1, self._plot_offsets[PLOT_POINTS - n:], out=idx)
+            np.mod(idx, maxlen, out=idx)
+            
+            tt = np.take(self.ring[:, 0], idx, out=self._plot_x[:n])
+            yy = np.take(self.ring[:, 1 + channel_idx], idx, out=self._plot_y[:n])
+            t_last = self.ring[(self.ring_pos - 1) % maxlen, 0]
         
+        tt -= t_last  # Make relative
         return tt, yy
     
     def shutdown(self):
@@ -471,67 +708,107 @@ class TrialManager:
         self.recorder = recorder
         self.audio = audio
         
-        self.running = False
-        self.paused = False
+        # Run/pause state as Events: _run is set while running, _resume is
+        # cleared while paused so the trial loop can block on it
+        self._run = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
         
-        self.current_action = "REPOSO"
-        self.current_instruction = "Listo para comenzar"
-        self.time_remaining = 0.0
         self.trial_count = 0
         
-        self.state_lock = threading.Lock()
+        # Published state: (action, instruction, deadline, trial_count, version).
+        # Replaced as a whole tuple, so readers never need a lock; deadline is the
+        # time.monotonic() at which the current phase ends, version increases on
+        # every publish so the UI can skip unchanged frames.
+        self._state_version = 0
+        self._state = ("REPOSO", "Listo para comenzar", 0.0, 0, 0)
+        
+        # Set by stop()/pause() so waits in _trial_loop return immediately
+        self._wake = threading.Event()
+        
+        # Optional callback, invoked after every published state change
+        self.on_state_change = None
+    
+    @property
+    def running(self) -> bool:
+        return self._run.is_set()
+    
+    @property
+    def paused(self) -> bool:
+        return not self._resume.is_set()
     
     def get_state(self):
         """Get current trial state"""
-        with self.state_lock:
-            return {
-                "action": self.current_action,
-                "instruction": self.current_instruction,
-                "time_remaining": self.time_remaining,
-                "trial_count": self.trial_count,
-                "running": self.running,
-                "paused": self.paused,
-            }
+        action, instruction, deadline, trial_count, version = self._state
+        return {
+            "version": version,
+            "action": action,
+            "instruction": instruction,
+            "time_remaining": max(0.0, deadline - time.monotonic()),
+            "trial_count": trial_count,
+            "running": self.running,
+            "paused": self.paused,
+        }
     
     def start(self):
         """Start trial sequence"""
         if self.running:
             return
         
-        self.running = True
-        self.paused = False
         self.trial_count = 0
+        self._wake.clear()
+        self._resume.set()
+        self._run.set()
         
         threading.Thread(target=self._trial_loop, daemon=True).start()
     
     def pause(self):
         """Toggle pause"""
-        self.paused = not self.paused
+        if self._resume.is_set():
+            self._resume.clear()
+        else:
+            self._resume.set()
+        self._wake.set()
     
     def stop(self):
         """Stop trial sequence"""
-        self.running = False
+        self._run.clear()
+        self._resume.set()  # release a paused loop so it can exit
+        self._wake.set()
+    
+    def _update_state(self, action: str, instruction: str, time_remaining: float) -> float:
+        """Publish current state; returns the phase deadline (time.monotonic())"""
+        deadline = time.monotonic() + time_remaining
+        self._state_version += 1
+        self._state = (action, instruction, deadline, self.trial_count, self._state_version)
+        if self.on_state_change is not None:
+            self.on_state_change()
+        return deadline
     
-    def _update_state(self, action: str, instruction: str, time_remaining: float):
-        """Update current state"""
-        with self.state_lock:
-            self.current_action = action
-            self.current_instruction = instruction
-            self.time_remaining = time_remaining
+    def _wait_until(self, deadline: float) -> bool:
+        """Sleep until a time.monotonic() deadline; returns False if stopped first"""
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            self._wake.wait(remaining)
+            self._wake.clear()
+        return False
     
     def _trial_loop(self):
         """Main trial loop"""
+        pin_current_thread(TRIAL_THREAD_CPU)
         
         # Initial rest
         self._update_state("REPOSO", "Póngase cómodo. Comenzando pronto...", 3.0)
         self.recorder.set_label("REPOSO")
-        time.sleep(3)
+        self._wait_until(time.monotonic() + 3.0)
         
         while self.running:
-            # Check pause
-            while self.paused and self.running:
+            # Check pause (blocks with no polling until resumed or stopped)
+            if self.paused and self.running:
                 self._update_state("PAUSADO", "Pausado - Presione Continuar", 0.0)
-                time.sleep(0.5)
+                self._resume.wait()
             
             if not self.running:
                 break
@@ -543,19 +820,22 @@ class TrialManager:
                 
                 self.trial_count += 1
                 
-                # Countdown phase
+                # Countdown phase: tick k fires at t0 + (n - k) seconds, so work done
+                # per tick (audio, state publish) doesn't accumulate as drift
                 self.audio.speak_ready()
-                for countdown in range(int(COUNTDOWN_DURATION_S), 0, -1):
+                n_ticks = int(COUNTDOWN_DURATION_S)
+                t0 = time.monotonic()
+                for countdown in range(n_ticks, 0, -1):
                     if not self.running:
                         break
                     self._update_state(
                         "PREPÁRESE",
                         f"Siguiente: {action_name}",
-                        float(countdown)
+                        t0 + n_ticks - time.monotonic()
                     )
                     if countdown <= 3:
                         self.audio.speak_countdown(countdown)
-                    time.sleep(1)
+                    self._wait_until(t0 + (n_ticks - countdown + 1))
                 
                 if not self.running:
                     break
@@ -564,30 +844,16 @@ class TrialManager:
                 self.audio.speak_action(action_name)
                 self.recorder.set_label(action_name)
                 
-                t_start = time.time()
-                while time.time() - t_start < ACTION_DURATION_S:
-                    if not self.running:
-                        break
-                    elapsed = time.time() - t_start
-                    remaining = ACTION_DURATION_S - elapsed
-                    self._update_state(action_name, action_desc, remaining)
-                    time.sleep(0.1)
-                
-                if not self.running:
+                deadline = self._update_state(action_name, action_desc, ACTION_DURATION_S)
+                if not self._wait_until(deadline):
                     break
                 
                 # Rest phase
                 self.audio.speak("Reposo")
                 self.recorder.set_label("REPOSO")
                 
-                t_start = time.time()
-                while time.time() - t_start < REST_DURATION_S:
-                    if not self.running:
-                        break
-                    elapsed = time.time() - t_start
-                    remaining = REST_DURATION_S - elapsed
-                    self._update_state("REPOSO", "Relájese y respire normalmente", remaining)
-                    time.sleep(0.1)
+                deadline = self._update_state("REPOSO", "Relájese y respire normalmente", REST_DURATION_S)
+                self._wait_until(deadline)
         
         # End
         self._update_state("TERMINADO", "¡Sesión completa! ¡Excelente trabajo!", 0.0)
@@ -608,6 +874,23 @@ def run_ui():
     ui_state = {
         "connected": False,
         "status": "Listo para conectar",
+        "ui_ready": False,
+    }
+    
+    # Numeric item ids, filled in when the UI is built (skips tag lookups in ui_tick)
+    ui_ids = {}
+    
+    ui_batch = BatchedUI()
+    
+    # Reused [x, y] payload for the line series (set_value copies it into DPG)
+    plot_payload = [None, None]
+    
+    # Last values pushed by ui_tick, so unchanged widgets are skipped
+    ui_last = {
+        "state_version": -1,
+        "timer": None,
+        "stats": None,
+        "samples_total": -1,
     }
     
     def set_status(msg: str):
@@ -654,55 +937,72 @@ def run_ui():
     
     def on_manual_mark(label: str):
         """Manually mark an event"""
-        recorder.set_label(label)
+        t_press = local_clock()  # stamp the keypress itself, not the later dispatch
+        recorder.set_label(label, t_press)
         # Speak in Spanish
-        label_spanish = {
-            "PARPADEO_DERECHO": "Parpadeo derecho",
-            "PARPADEO_IZQUIERDO": "Parpadeo izquierdo",
-            "LEVANTAR_CEJAS": "Levantar cejas",
-            "REPOSO": "Reposo"
-        }
-        audio.speak(label_spanish.get(label, label))
+        audio.speak(LABEL_SPANISH.get(label, label))
         set_status(f"Marcado manual: {label}")
     
-    def ui_tick():
-        """Update UI elements"""
-        
-        # Get trial state
-        state = trial_manager.get_state()
-        
-        # Update main display - Make text BIGGER by spacing
-        if dpg.does_item_exist("action_text"):
-            action_display = "    " + "   ".join(state["action"]) + "    "
-            dpg.set_value("action_text", action_display)
-        
-        if dpg.does_item_exist("instruction_text"):
-            dpg.set_value("instruction_text", state["instruction"])
-        
-        if dpg.does_item_exist("timer_text"):
-            dpg.set_value("timer_text", f"{state['time_remaining']:.1f}s")
-        
-        if dpg.does_item_exist("trial_count_text"):
-            dpg.set_value("trial_count_text", f"Prueba: {state['trial_count']}")
-        
-        # Update stats
-        if dpg.does_item_exist("stats_text"):
-            c = recorder.event_counts
-            stats = (
-                f"Muestras: {recorder.samples_total}  |  "
-                f"Pérdidas: {recorder.dropouts}  |  "
-                f"Grabando: {recorder.is_recording}\n"
-                f"REPOSO: {c.get('REPOSO', 0)}  |  "
-                f"PARPADEO_DER: {c.get('PARPADEO_DERECHO', 0)}  |  "
-                f"PARPADEO_IZQ: {c.get('PARPADEO_IZQUIERDO', 0)}  |  "
-                f"LEVANTAR_CEJAS: {c.get('LEVANTAR_CEJAS', 0)}"
-            )
-            dpg.set_value("stats_text", stats)
+    def _push_timer(batch, state):
+        # Timer is quantized to 0.1 s; push only when the text changes
+        timer = f"{state['time_remaining']:.1f}s"
+        if timer != ui_last["timer"]:
+            ui_last["timer"] = timer
+            batch.set(ui_ids["timer"], timer)
+    
+    def ui_tick_state():
+        """Update trial display (called when the trial manager publishes a new state)"""
+        if not ui_state["ui_ready"]:
+            return
         
-        # Update plot
-        tt, yy = recorder.get_plot_data(channel_idx=1)  # AF7
-        if dpg.does_item_exist("series"):
-            dpg.set_value("series", [tt.tolist(), yy.tolist()])
+        with ui_batch as batch:
+            state = trial_manager.get_state()
+            
+            # Action/instruction/trial count only change when the trial loop publishes
+            if state["version"] != ui_last["state_version"]:
+                ui_last["state_version"] = state["version"]
+                
+                # Update main display - Make text BIGGER by spacing
+                action = state["action"]
+                action_display = ACTION_DISPLAY.get(action) or "    " + "   ".join(action) + "    "
+                batch.set(ui_ids["action"], action_display)
+                batch.set(ui_ids["instruction"], state["instruction"])
+                batch.set(ui_ids["trial_count"], f"Prueba: {state['trial_count']}")
+            
+            _push_timer(batch, state)
+    
+    def ui_tick_plot():
+        """Update live data: timer, stats and EEG plot (fixed-rate heartbeat)"""
+        if not ui_state["ui_ready"]:
+            return
+        
+        with ui_batch as batch:
+            _push_timer(batch, trial_manager.get_state())
+            
+            # Update stats
+            c = recorder.get_event_counts()
+            stats_key = (
+                recorder.samples_total, recorder.dropouts, recorder.is_recording,
+                *c,
+            )
+            if stats_key != ui_last["stats"]:
+                ui_last["stats"] = stats_key
+                stats = (
+                    f"Muestras: {stats_key[0]}  |  "
+                    f"Pérdidas: {stats_key[1]}  |  "
+                    f"Grabando: {stats_key[2]}\n"
+                    f"REPOSO: {stats_key[3]}  |  "
+                    f"PARPADEO_DER: {stats_key[4]}  |  "
+                    f"PARPADEO_IZQ: {stats_key[5]}  |  "
+                    f"LEVANTAR_CEJAS: {stats_key[6]}"
+                )
+                batch.set(ui_ids["stats"], stats)
+            
+            # Update plot (only when new samples arrived)
+            if recorder.samples_total != ui_last["samples_total"]:
+                ui_last["samples_total"] = recorder.samples_total
+                plot_payload[0], plot_payload[1] = recorder.get_plot_data(channel_idx=1)  # AF7
+                batch.set(ui_ids["series"], plot_payload)
     
     def key_handler(sender, key):
         """Handle keyboard shortcuts"""
@@ -713,23 +1013,8 @@ def run_ui():
     # Build UI
     dpg.create_context()
     
-    # Create LARGE font for elderly users
-    with dpg.font_registry():
-        # Default font but MUCH larger
-        large_font = dpg.add_font("./fonts/default.ttf", 32, default_font=False) if Path("./fonts/default.ttf").exists() else None
-        huge_font = dpg.add_font("./fonts/default.ttf", 48, default_font=False) if Path("./fonts/default.ttf").exists() else None
-    
-    # Large, clear theme for elderly users
-    with dpg.theme() as global_theme:
-        with dpg.theme_component(dpg.mvAll):
-            dpg.add_theme_style(dpg.mvStyleVar_WindowPadding, 24, 24)
-            dpg.add_theme_style(dpg.mvStyleVar_FramePadding, 16, 12)
-            dpg.add_theme_style(dpg.mvStyleVar_ItemSpacing, 16, 16)
-            dpg.add_theme_style(dpg.mvStyleVar_FrameRounding, 12)
-            dpg.add_theme_style(dpg.mvStyleVar_WindowRounding, 16)
-            dpg.add_theme_style(dpg.mvStyleVar_GrabRounding, 12)
-    
-    dpg.bind_theme(global_theme)
+    # Large fonts and clear theme for elderly users
+    large_font, huge_font = setup_fonts_and_theme()
     
     # Main window
     with dpg.window(tag="primary", label="Captura de Artefactos Faciales", width=1200, height=850):
@@ -776,7 +1061,7 @@ def run_ui():
             
             # Current action (HUGE text) - Simulated with multiple spaces
             with dpg.group(horizontal=False):
-                dpg.add_text(
+                ui_ids["action"] = dpg.add_text(
                     "    R E P O S O    ",
                     tag="action_text",
                     color=(100, 255, 150)
@@ -788,7 +1073,7 @@ def run_ui():
                 )
                 dpg.add_spacer(height=18)
                 
-                dpg.add_text(
+                ui_ids["instruction"] = dpg.add_text(
                     "Listo para comenzar",
                     tag="instruction_text",
                     color=(220, 220, 220)
@@ -800,13 +1085,13 @@ def run_ui():
                         "Tiempo: ",
                         color=(200, 200, 200)
                     )
-                    dpg.add_text(
+                    ui_ids["timer"] = dpg.add_text(
                         "0.0s",
                         tag="timer_text",
                         color=(255, 255, 100)
                     )
                     dpg.add_spacer(width=50)
-                    dpg.add_text(
+                    ui_ids["trial_count"] = dpg.add_text(
                         "Prueba: 0",
                         tag="trial_count_text",
                         color=(200, 200, 200)
@@ -851,7 +1136,7 @@ def run_ui():
         with dpg.child_window(height=90, border=True):
             dpg.add_text("Estadísticas de la Sesión:", color=(200, 200, 200))
             dpg.add_spacer(height=5)
-            dpg.add_text(
+            ui_ids["stats"] = dpg.add_text(
                 "Muestras: 0  |  Pérdidas: 0  |  Grabando: False",
                 tag="stats_text",
                 color=(220, 220, 220)
@@ -865,7 +1150,7 @@ def run_ui():
             with dpg.plot(height=150, width=-1, anti_aliased=True):
                 xaxis = dpg.add_plot_axis(dpg.mvXAxis, label="")
                 yaxis = dpg.add_plot_axis(dpg.mvYAxis, label="µV")
-                dpg.add_line_series([0, 1], [0, 0], parent=yaxis, tag="series")
+                ui_ids["series"] = dpg.add_line_series([0, 1], [0, 0], parent=yaxis, tag="series")
         
         dpg.add_spacer(height=10)
         dpg.add_text(
@@ -877,11 +1162,13 @@ def run_ui():
     dpg.create_viewport(
         title="Captura de Artefactos Faciales - Adultos Mayores", 
         width=1250, 
-        height=900
+        height=900,
+        vsync=False  # frames are paced in the render loop below
     )
     dpg.setup_dearpygui()
     dpg.show_viewport()
     dpg.set_primary_window("primary", True)
+    ui_state["ui_ready"] = True
     
     # Register keyboard handler
     with dpg.handler_registry():
@@ -895,17 +1182,57 @@ def run_ui():
     
     atexit.register(cleanup)
     
-    # Main render loop
-    UI_FPS = 20
-    last_ui = time.time()
+    # UI updates run on their own thread: trial state is pushed only when
+    # the trial manager publishes a change, live data on a UI_FPS heartbeat
+    UI_FPS = 10
+    ui_wake = threading.Event()
+    ui_stop = threading.Event()
     
-    while dpg.is_dearpygui_running():
-        dpg.render_dearpygui_frame()
+    def ui_loop():
+        interval = 1.0 / UI_FPS
+        next_plot = time.monotonic()
+        while not ui_stop.is_set():
+            if ui_wake.wait(max(0.0, next_plot - time.monotonic())):
+                ui_wake.clear()
+                if ui_stop.is_set():
+                    break
+                ui_tick_state()
+            
+            now = time.monotonic()
+            if now >= next_plot:
+                ui_tick_plot()
+                next_plot = max(next_plot + interval, now)
+    
+    trial_manager.on_state_change = ui_wake.set
+    ui_thread = threading.Thread(target=ui_loop, daemon=True)
+    ui_thread.start()
+    
+    # Main render loop (presentation only)
+    RENDER_FPS = 30
+    frame_interval = 1.0 / RENDER_FPS
+    
+    # Bind hot-loop callables to locals (avoids global/attribute lookups per frame)
+    _is_running = dpg.is_dearpygui_running
+    _render = dpg.render_dearpygui_frame
+    _monotonic = time.monotonic
+    _sleep = time.sleep
+    
+    next_frame = _monotonic()
+    
+    while _is_running():
+        # Sleep until the next frame slot instead of rendering as fast as possible
+        next_frame += frame_interval
+        now = _monotonic()
+        if next_frame > now:
+            _sleep(next_frame - now)
+        else:
+            next_frame = now  # fell behind, don't try to catch up
         
-        now = time.time()
-        if now - last_ui >= (1.0 / UI_FPS):
-            last_ui = now
-            ui_tick()
+        _render()
+    
+    ui_stop.set()
+    ui_wake.set()
+    ui_thread.join(timeout=1.0)
     
     cleanup()
     dpg.destroy_context()
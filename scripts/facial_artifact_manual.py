@@ -27,11 +27,11 @@ IMPORTANTE: Debe tener 'muselsl stream -a 00:55:da:b5:b3:1e' corriendo en otra t
 import sys
 import time
 import csv
+import queue
 import threading
-import pandas as pd
+import numpy as np
 from pathlib import Path
 from datetime import datetime
-from collections import Counter
 from pylsl import resolve_streams, StreamInlet, resolve_byprop
 
 # Audio
@@ -42,6 +42,14 @@ except ImportError:
     AUDIO_AVAILABLE = False
     print("⚠️  pyttsx3 no disponible. Instalar con: pip install pyttsx3")
 
+# Escritura CSV rápida (opcional)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 # =========================
 # CONFIG
 # =========================
@@ -49,9 +57,32 @@ MUSE_MAC = "00:55:da:b5:b3:1e"
 DATA_ROOT = Path("facial_artifact_datasets")
 DATA_ROOT.mkdir(parents=True, exist_ok=True)
 
+# Mensajes de audio por acción
+ACTION_MESSAGES = {
+    "PARPADEO_DERECHO": "Parpadee con el ojo derecho varias veces",
+    "PARPADEO_IZQUIERDO": "Parpadee con el ojo izquierdo varias veces",
+    "LEVANTAR_CEJAS": "Levante las cejas hacia arriba y abajo",
+    "REPOSO": "Reposo. Relájese"
+}
+
+# Etiquetas de datos; en memoria se guardan como códigos uint8 (índice en esta lista)
+LABEL_NAMES = ["REPOSO", "PARPADEO_DERECHO", "PARPADEO_IZQUIERDO", "LEVANTAR_CEJAS"]
+LABEL_CODES = {name: i for i, name in enumerate(LABEL_NAMES)}
+
+# Buffer del inlet LSL (segundos) y tamaño de chunk de transporte
+LSL_MAX_BUFLEN_S = 10
+LSL_MAX_CHUNKLEN = 64
+
+# Intervalo del feedback en vivo en terminal (segundos)
+FEEDBACK_INTERVAL_S = 0.5
+
+# Capacidad inicial de la arena cuando la duración es ilimitada (se duplica al llenarse)
+ARENA_INITIAL_SECONDS = 60
+
 # Keyboard handling
 try:
     import msvcrt  # Windows
+    from console_input import wait_for_key
     PLATFORM = 'windows'
 except ImportError:
     try:
@@ -69,7 +100,7 @@ class AudioCueManager:
     def __init__(self):
         self.enabled = AUDIO_AVAILABLE
         self.engine = None
-        self.lock = threading.Lock()
+        self._q = queue.Queue()
         
         if self.enabled:
             try:
@@ -90,6 +121,20 @@ class AudioCueManager:
             except Exception as e:
                 print(f"⚠️  Error audio: {e}")
                 self.enabled = False
+        
+        # Un solo hilo de voz; speak() solo encola el texto
+        if self.enabled:
+            threading.Thread(target=self._speech_worker, daemon=True).start()
+    
+    def _speech_worker(self):
+        """Reproducir textos encolados uno a la vez"""
+        while True:
+            text = self._q.get()
+            try:
+                self.engine.say(text)
+                self.engine.runAndWait()
+            except Exception as e:
+                print(f"⚠️  Error audio: {e}")
     
     def speak(self, text: str):
         """Hablar texto de forma asíncrona"""
@@ -97,26 +142,11 @@ class AudioCueManager:
             print(f"[AUDIO] {text}")
             return
         
-        def _speak():
-            with self.lock:
-                try:
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                except Exception as e:
-                    print(f"⚠️  Error audio: {e}")
-        
-        threading.Thread(target=_speak, daemon=True).start()
+        self._q.put_nowait(text)
     
     def cue_action(self, action: str):
         """Audio cue para cada acción"""
-        messages = {
-            "PARPADEO_DERECHO": "Parpadee con el ojo derecho varias veces",
-            "PARPADEO_IZQUIERDO": "Parpadee con el ojo izquierdo varias veces",
-            "LEVANTAR_CEJAS": "Levante las cejas hacia arriba y abajo",
-            "REPOSO": "Reposo. Relájese"
-        }
-        msg = messages.get(action, action)
-        self.speak(msg)
+        self.speak(ACTION_MESSAGES.get(action, action))
 
 # =========================
 # Keyboard Handler
@@ -147,9 +177,10 @@ class KeyboardInputHandler:
         Returns: tecla presionada o None
         """
         if self.platform == 'windows':
-            if msvcrt.kbhit():
-                return msvcrt.getch().decode('utf-8')
-            return None
+            # Dormir sobre el handle de consola en vez de sondear kbhit()
+            if not wait_for_key(timeout):
+                return None
+            return msvcrt.getwch()
             
         elif self.platform == 'unix':
             import sys, select
@@ -192,13 +223,25 @@ class FacialArtifactSession:
         # Estado de la sesión
         self.is_recording = False
         self.start_time = None
+        self._started_at = None
+        self.session_dir = None
+        self.max_duration = None
         self.current_label = 'REPOSO'
-        
-        # Almacenamiento de datos
-        self.samples = []
-        self.timestamps = []
-        self.labels = []
-        self.label_changes = []
+        self._label_code = LABEL_CODES[self.current_label]  # lo que escribe el hilo de adquisición
+        
+        # Almacenamiento de datos: arena NumPy reservada al conectar el stream
+        self.ch_names = []
+        self._samples = None  # (N, canales) float32
+        self._ts = None       # (N,) float64
+        self._labels = None   # (N,) uint8, códigos de LABEL_NAMES
+        self._n = 0           # muestras escritas
+        
+        # Cambios de etiqueta en arreglos paralelos (crecen al doble al llenarse)
+        self._lc_time = np.empty(64, dtype=np.float64)
+        self._lc_from = np.empty(64, dtype=np.uint8)
+        self._lc_to = np.empty(64, dtype=np.uint8)
+        self._lc_sample = np.empty(64, dtype=np.int64)
+        self._lc_n = 0
         
         # Audio
         self.audio = AudioCueManager()
@@ -209,7 +252,12 @@ class FacialArtifactSession:
         # Threading
         self.recording_thread = None
         self.input_thread = None
+        self.feedback_thread = None
         self.stop_flag = threading.Event()
+        
+        # Conteos de muestras para el feedback en vivo (el print ocurre fuera
+        # del hilo de adquisición; None detiene el consumidor)
+        self._feedback_q = queue.Queue(maxsize=4)
     
     def display_instructions(self):
         """Mostrar instrucciones"""
@@ -228,16 +276,59 @@ class FacialArtifactSession:
         print(f"📝 Sesión: {self.session_name}")
         print("="*70 + "\n")
     
+    def _alloc_arena(self, capacity: int, n_channels: int):
+        """Reservar arena de muestras/timestamps/etiquetas"""
+        self._samples = np.empty((capacity, n_channels), dtype=np.float32)
+        self._ts = np.empty(capacity, dtype=np.float64)
+        self._labels = np.empty(capacity, dtype=np.uint8)
+        self._n = 0
+    
+    def _ensure_capacity(self, extra: int):
+        """Duplicar la arena si no caben `extra` muestras más (O(1) amortizado)"""
+        needed = self._n + extra
+        capacity = len(self._ts)
+        if needed <= capacity:
+            return
+        
+        capacity = max(needed, 2 * capacity)
+        n = self._n
+        samples = np.empty((capacity, self._samples.shape[1]), dtype=np.float32)
+        ts = np.empty(capacity, dtype=np.float64)
+        labels = np.empty(capacity, dtype=np.uint8)
+        samples[:n] = self._samples[:n]
+        ts[:n] = self._ts[:n]
+        labels[:n] = self._labels[:n]
+        self._samples, self._ts, self._labels = samples, ts, labels
+    
+    def _record_label_change(self, t: float, from_code: int, to_code: int, sample_index: int):
+        """Agregar un cambio de etiqueta a los arreglos _lc_*"""
+        i = self._lc_n
+        if i == len(self._lc_time):
+            capacity = 2 * i
+            for name in ('_lc_time', '_lc_from', '_lc_to', '_lc_sample'):
+                old = getattr(self, name)
+                new = np.empty(capacity, dtype=old.dtype)
+                new[:i] = old
+                setattr(self, name, new)
+        
+        self._lc_time[i] = t
+        self._lc_from[i] = from_code
+        self._lc_to[i] = to_code
+        self._lc_sample[i] = sample_index
+        self._lc_n = i + 1
+    
     def get_label_statistics(self):
         """Calcular distribución de etiquetas"""
-        if not self.labels:
+        if not self._n:
             return {}
         
-        counter = Counter(self.labels)
-        total = len(self.labels)
+        total = self._n
+        counts = np.bincount(self._labels[:total], minlength=len(LABEL_NAMES))
         
         stats = {}
-        for label, count in counter.items():
+        for label, count in zip(LABEL_NAMES, counts.tolist()):
+            if not count:
+                continue
             percentage = (count / total) * 100
             stats[label] = {
                 'count': count,
@@ -254,24 +345,31 @@ class FacialArtifactSession:
         print("\n" + "-"*60)
         print(f"  ESTADÍSTICAS (tiempo transcurrido: {elapsed:.1f}s)")
         print("-"*60)
-        print(f"Total de muestras: {len(self.samples)}")
+        print(f"Total de muestras: {self._n}")
         print(f"Etiqueta actual: {self.current_label}")
         print(f"\nDistribución de etiquetas:")
         
         for label, data in stats.items():
             print(f"  {label:20s}: {data['count']:5d} muestras ({data['percentage']:5.1f}%)")
         
-        print(f"\nCambios de etiqueta: {len(self.label_changes)}")
+        print(f"\nCambios de etiqueta: {self._lc_n}")
         print("-"*60 + "\n")
     
-    def display_live_feedback(self):
+    def display_live_feedback(self, sample_count):
         """Feedback en vivo durante la grabación"""
         elapsed = time.time() - self.start_time
-        sample_count = len(self.samples)
         
         print(f"\r  ⏺  GRABANDO: {elapsed:.1f}s | Muestras: {sample_count} | Etiqueta: [{self.current_label}]", 
               end='', flush=True)
     
+    def _feedback_consumer(self):
+        """Thread que imprime el feedback en vivo encolado por record_eeg_stream"""
+        while True:
+            sample_count = self._feedback_q.get()
+            if sample_count is None:
+                break
+            self.display_live_feedback(sample_count)
+    
     def handle_keyboard_input(self):
         """Thread para manejar input de teclado"""
         self.keyboard.setup_terminal()
@@ -299,15 +397,15 @@ class FacialArtifactSession:
                             # Cambiar etiqueta actual
                             if label_action != self.current_label:
                                 old_label = self.current_label
+                                old_code = self._label_code
                                 self.current_label = label_action
+                                self._label_code = LABEL_CODES[label_action]
                                 
                                 # Registrar cambio
-                                self.label_changes.append({
-                                    'time': time.time() - self.start_time,
-                                    'from': old_label,
-                                    'to': self.current_label,
-                                    'sample_index': len(self.samples)
-                                })
+                                self._record_label_change(
+                                    time.time() - self.start_time,
+                                    old_code, self._label_code, self._n
+                                )
                                 
                                 # Audio cue
                                 self.audio.cue_action(self.current_label)
@@ -330,7 +428,7 @@ class FacialArtifactSession:
                 self.stop_flag.set()
                 return
             
-            inlet = StreamInlet(streams[0], max_chunklen=12)
+            inlet = StreamInlet(streams[0], max_buflen=LSL_MAX_BUFLEN_S, max_chunklen=LSL_MAX_CHUNKLEN)
             info = inlet.info()
             
             # Obtener nombres de canales
@@ -340,27 +438,49 @@ class FacialArtifactSession:
                 self.ch_names.append(ch.child_value('label'))
                 ch = ch.next_sibling()
             
+            # Buffer destino reutilizable para pull_chunk (sin listas por chunk)
+            self._sample_buf = np.empty((256, info.channel_count()), dtype=np.float32)
+            
+            # Arena dimensionada para la sesión completa si hay duración máxima
+            srate = info.nominal_srate() or 256.0
+            seconds = (self.max_duration + 5) if self.max_duration else ARENA_INITIAL_SECONDS
+            self._alloc_arena(int(seconds * srate), info.channel_count())
+            
             print(f"✅ Conectado a: {info.name()}")
             print(f"📊 Canales: {', '.join(self.ch_names)}")
             print(f"🔄 Frecuencia: {info.nominal_srate()} Hz")
             print("\n>>> ¡Grabación iniciada! Use el teclado para etiquetar.\n")
             
-            # Registrar muestras
-            feedback_counter = 0
-            while not self.stop_flag.is_set():
-                samples_chunk, timestamps_chunk = inlet.pull_chunk(timeout=0.0, max_samples=256)
+            # Registrar muestras. Por chunk solo hay asignaciones de slices NumPy
+            # (copias en C); el resto del trabajo Python queda fuera del bucle.
+            pull_chunk = inlet.pull_chunk
+            sample_buf = self._sample_buf
+            stopped = self.stop_flag.is_set
+            monotonic = time.monotonic
+            last_feedback = 0.0
+            while not stopped():
+                # Bloquea en liblsl hasta 20 ms esperando datos (sin sleep de sondeo)
+                _, timestamps_chunk = pull_chunk(
+                    timeout=0.02, max_samples=256, dest_obj=sample_buf
+                )
                 
                 if timestamps_chunk:
-                    self.samples.extend(samples_chunk)
-                    self.timestamps.extend(timestamps_chunk)
-                    self.labels.extend([self.current_label] * len(timestamps_chunk))
+                    n = len(timestamps_chunk)
+                    i = self._n
+                    if i + n > len(self._ts):
+                        self._ensure_capacity(n)
+                    self._samples[i:i + n] = sample_buf[:n]
+                    self._ts[i:i + n] = timestamps_chunk
+                    self._labels[i:i + n] = self._label_code
+                    self._n = i + n
                     
-                    feedback_counter += len(timestamps_chunk)
-                    if feedback_counter >= 50:
-                        self.display_live_feedback()
-                        feedback_counter = 0
-                else:
-                    time.sleep(0.01)
+                    now = monotonic()
+                    if now - last_feedback >= FEEDBACK_INTERVAL_S:
+                        last_feedback = now
+                        try:
+                            self._feedback_q.put_nowait(self._n)
+                        except queue.Full:
+                            pass  # la terminal va atrasada; descartar esta actualización
         
         except Exception as e:
             print(f"\n❌ ERROR durante grabación: {e}")
@@ -370,31 +490,46 @@ class FacialArtifactSession:
     
     def save_labeled_data(self):
         """Guardar datos etiquetados a CSV"""
-        if not self.samples:
+        if not self._n:
             print("\n⚠️  No hay datos para guardar.")
             return None
         
-        # Nombre de archivo
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        session_dir = DATA_ROOT / f"FACIAL_{self.participant_id}_{timestamp}"
-        session_dir.mkdir(parents=True, exist_ok=True)
-        
-        filename = session_dir / "labeled_data.csv"
+        filename = self.session_dir / "labeled_data.csv"
         
         try:
-            df = pd.DataFrame(self.samples, columns=self.ch_names)
-            df['timestamp'] = self.timestamps
-            df['label'] = self.labels
-            
-            # Tiempo relativo
-            if self.timestamps:
-                first_timestamp = self.timestamps[0]
-                df['relative_time'] = [t - first_timestamp for t in self.timestamps]
+            # Escribir directo desde la arena, sin DataFrame intermedio
+            n = self._n
+            samples = self._samples[:n]
+            ts = self._ts[:n]
+            relative_time = ts - ts[0]
+            header = [*self.ch_names, 'timestamp', 'label', 'relative_time']
             
-            df.to_csv(filename, index=False)
+            if ARROW_AVAILABLE:
+                # Escritor columnar de pyarrow; las etiquetas van como diccionario
+                # (códigos uint8 + LABEL_NAMES), se decodifican al escribir
+                labels = pa.DictionaryArray.from_arrays(
+                    pa.array(self._labels[:n]), pa.array(LABEL_NAMES)
+                )
+                columns = [pa.array(samples[:, c]) for c in range(samples.shape[1])]
+                columns += [pa.array(ts), labels, pa.array(relative_time)]
+                
+                with open(filename, 'wb') as f:
+                    f.write((','.join(header) + '\n').encode('utf-8'))
+                    pacsv.write_csv(
+                        pa.Table.from_arrays(columns, names=header), f,
+                        pacsv.WriteOptions(include_header=False, quoting_style='none'),
+                    )
+            else:
+                labels = np.array(LABEL_NAMES)[self._labels[:n]]  # decodificar solo al guardar
+                with open(filename, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    writer.writerows(zip(
+                        *samples.T.tolist(), ts.tolist(), labels.tolist(), relative_time.tolist()
+                    ))
             
             print(f"\n✅ Datos guardados: {filename}")
-            print(f"   Total de muestras: {len(self.samples)}")
+            print(f"   Total de muestras: {n}")
             
             # Estadísticas finales
             self.display_statistics()
@@ -407,35 +542,38 @@ class FacialArtifactSession:
     
     def save_session_metadata(self):
         """Guardar metadata de la sesión"""
-        if not self.label_changes:
+        n = self._lc_n
+        if not n:
             return
         
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        session_dir = DATA_ROOT / f"FACIAL_{self.participant_id}_{timestamp}"
-        session_dir.mkdir(parents=True, exist_ok=True)
-        
-        metadata_file = session_dir / "label_changes.csv"
+        metadata_file = self.session_dir / "label_changes.csv"
         
         try:
             with open(metadata_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['time', 'from', 'to', 'sample_index'])
-                writer.writeheader()
-                writer.writerows(self.label_changes)
+                writer = csv.writer(f)
+                writer.writerow(['time', 'from', 'to', 'sample_index'])
+                names = np.array(LABEL_NAMES)
+                writer.writerows(zip(
+                    self._lc_time[:n].tolist(),
+                    names[self._lc_from[:n]].tolist(),
+                    names[self._lc_to[:n]].tolist(),
+                    self._lc_sample[:n].tolist(),
+                ))
             
             print(f"📝 Metadata guardada: {metadata_file}")
             
             # Guardar también meta.json
             import json
-            meta_file = session_dir / "meta.json"
+            meta_file = self.session_dir / "meta.json"
             meta = {
                 "participant_id": self.participant_id,
                 "session_name": self.session_name,
-                "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.start_time)),
+                "started_at": self._started_at,
                 "duration_seconds": time.time() - self.start_time,
-                "total_samples": len(self.samples),
+                "total_samples": self._n,
                 "channels": self.ch_names,
                 "label_counts": self.get_label_statistics(),
-                "label_changes_count": len(self.label_changes)
+                "label_changes_count": n
             }
             
             with open(meta_file, 'w', encoding='utf-8') as f:
@@ -462,6 +600,13 @@ class FacialArtifactSession:
         
         # Inicializar
         self.start_time = time.time()
+        self._started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.start_time))
+        self.max_duration = max_duration
+        
+        # Un solo directorio por sesión para datos y metadata
+        session_timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.start_time))
+        self.session_dir = DATA_ROOT / f"FACIAL_{self.participant_id}_{session_timestamp}"
+        self.session_dir.mkdir(parents=True, exist_ok=True)
         self.is_recording = True
         self.stop_flag.clear()
         
@@ -474,6 +619,9 @@ class FacialArtifactSession:
         self.input_thread = threading.Thread(target=self.handle_keyboard_input, daemon=True)
         self.input_thread.start()
         
+        self.feedback_thread = threading.Thread(target=self._feedback_consumer, daemon=True)
+        self.feedback_thread.start()
+        
         # Monitorear sesión
         try:
             while not self.stop_flag.is_set():
@@ -493,6 +641,8 @@ class FacialArtifactSession:
         print("\n⏹️  Deteniendo grabación...")
         self.recording_thread.join(timeout=2)
         self.input_thread.join(timeout=2)
+        self._feedback_q.put(None)
+        self.feedback_thread.join(timeout=2)
         
         self.is_recording = False
         
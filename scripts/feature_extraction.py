@@ -1,6 +1,50 @@
 import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Optional
 
+# Optional Numba JIT for the window feature kernel
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+
+def _window_features_loop(sig2d, window_size, step):
+    """
+    RMS, MAV and energy per window for a (n_channels, n_samples) float32 array,
+    computed in one pass per window. Returns three (n_channels, n_windows) arrays.
+    """
+    n_ch, n = sig2d.shape
+    n_win = (n - window_size) // step + 1
+    rms = np.empty((n_ch, n_win), np.float32)
+    mav = np.empty((n_ch, n_win), np.float32)
+    energy = np.empty((n_ch, n_win), np.float32)
+
+    for c in prange(n_ch):
+        for w in range(n_win):
+            start = w * step
+            e = 0.0
+            m = 0.0
+            for i in range(window_size):
+                v = sig2d[c, start + i]
+                e += v * v
+                m += abs(v)
+            energy[c, w] = e
+            rms[c, w] = np.sqrt(e / window_size)
+            mav[c, w] = m / window_size
+
+    return rms, mav, energy
+
+
+if NUMBA_AVAILABLE:
+    _window_features_kernel = njit(parallel=True, fastmath=True, cache=True)(_window_features_loop)
+else:
+    _window_features_kernel = None
+
+
 class FeatureExtractor:
     def __init__(self, dataframe):
         self.df = dataframe 
@@ -18,18 +62,23 @@ class FeatureExtractor:
         Returns:
             normalized_motor_dataframe: DataFrame with normalized motor EEG data
         """
-        rest_df_tonorm = rest_dataframe.copy()
-        motor_df_tonorm = motor_dataframe.copy()
-
-        for column in motor_dataframe.columns:
-            rest_mean = rest_df_tonorm[column].mean()
-            rest_std = rest_df_tonorm[column].std()
-            z_rest = (rest_df_tonorm[column] - rest_mean) / rest_std
-            z_motor = (motor_df_tonorm[column] - rest_mean) / rest_std
-            motor_df_tonorm[column] = z_motor
-            normalized_motor_dataframe = motor_df_tonorm
-            rest_df_tonorm[column] = z_rest
-            normalized_rest_dataframe = rest_df_tonorm
+        columns = motor_dataframe.columns
+
+        # Z-score every channel at once with the rest statistics (ddof=1, as pandas .std()).
+        rest_arr = rest_dataframe[columns].to_numpy(dtype=np.float64)
+        motor_arr = motor_dataframe.to_numpy(dtype=np.float64)
+
+        rest_mean = rest_arr.mean(axis=0)
+        rest_std = rest_arr.std(axis=0, ddof=1)
+        rest_std[rest_std == 0] = 1.0  # flat channel: center only, avoid division by zero
+
+        normalized_rest_dataframe = rest_dataframe.copy()
+        normalized_rest_dataframe[columns] = (rest_arr - rest_mean) / rest_std
+        normalized_motor_dataframe = pd.DataFrame(
+            (motor_arr - rest_mean) / rest_std,
+            index=motor_dataframe.index,
+            columns=columns,
+        )
         return normalized_rest_dataframe, normalized_motor_dataframe
 
 
@@ -37,6 +86,9 @@ class FeatureExtractor:
         """
         Extracts a 1D EEG signal array in temporal sub windows (which can overlap) 
         and computes features for each window: RMS, MAV, TOTAL ENERGY.
+        A 2D array / DataFrame (n_samples, n_channels) is processed for all
+        channels at once (Numba kernel parallelized over channels when numba
+        is installed, vectorized NumPy otherwise).
 
         EEG Signals are mathematically considered as non-stationary signals; 
         however, this function assumes quasi-stationarity within short time windows.
@@ -53,9 +105,9 @@ class FeatureExtractor:
         Energy comparisons between different window sizes may not be meaningful.
 
         Args:
-            df: DataFrame containing EEG data.
+            df: Series/1D array for one channel, or DataFrame/2D array (n_samples, n_channels).
             window_duration: Duration of each window in seconds.
-            overlap: Overlap between consecutive windows in seconds.
+            overlap: Overlap between consecutive windows, as a fraction of the window (0.0 - <1.0).
         
         Returns:
         - times: ndarray
@@ -66,10 +118,14 @@ class FeatureExtractor:
             Mean Absolute Value for each window.
         - energy_vec: ndarray
             Total Energy for each window.
+        Feature arrays are (n_windows,) for 1D input and (n_channels, n_windows) for 2D input.
         """
 
-        # 1. Convert df into a NP array for math consistency.
-        signal = np.asarray(df)
+        # 1. Convert df into a contiguous float32 NP array for math consistency.
+        signal = np.ascontiguousarray(np.asarray(df), dtype=np.float32)
+        single_channel = signal.ndim == 1
+        if single_channel:
+            signal = signal[:, None]
 
         # 2. Convert the window duration into amount of data samples.
         window_size = int(window_duration * self.sampling_rate)
@@ -78,49 +134,39 @@ class FeatureExtractor:
             # - overlap = 0.0  → step = window_length (sin solapamiento)
             # - overlap = 0.5  → step = window_length / 2
 
-        step = int(window_size * 1 - overlap)
+        step = max(1, int(window_size * (1 - overlap)))
 
         # 4. Total number of samples in the data frame.
         n = len(signal)
 
-        # 5. Compute starting index of each window (cut if incomplete)
-        start_indexes = np.arange(0, n - window_size + 1, step)
-
-        # 6. Initialize empty feature vectors.
-        rms_vec = []
-        mav_vec = []
-        energy_vec = []
-        times = []
-
-        # Loop for extraction.abs
-        for start in start_indexes:
-
-            #1. extract segment
-            segment = signal[start : start + window_size]
-
-            # 2. rms
-            rms = np.sqrt(np.mean(segment ** 2))
-
-            # 3. mav
-            mav = np.mean(np.abs(segment))
-
-            # 4. total energy
-            energy = np.sum(segment ** 2)
-
-            # 5. center time of the window
-            center_time = (start + window_size / 2) / self.sampling_rate
-
-            # Append features to vectors
-            rms_vec.append(rms)
-            mav_vec.append(mav)
-            energy_vec.append(energy)
-            times.append(center_time)
-
-        # Convert feature lists to numpy arrays
-        rms_vec = np.array(rms_vec)
-        mav_vec = np.array(mav_vec)
-        energy_vec = np.array(energy_vec)
-        times = np.array(times)
+        if window_size < 1 or n < window_size:
+            empty = np.empty((signal.shape[1], 0), dtype=np.float32)
+            if single_channel:
+                empty = empty[0]
+            return np.empty(0), empty, empty.copy(), empty.copy()
+
+        if NUMBA_AVAILABLE:
+            # 5-6. One pass per window in the compiled kernel, channels as
+            #      contiguous rows (incomplete trailing window is cut)
+            sig2d = np.ascontiguousarray(signal.T)
+            rms_vec, mav_vec, energy_vec = _window_features_kernel(sig2d, window_size, step)
+        else:
+            # 5. Build a (n_windows, n_channels, window_size) view of the signal, one
+            #    entry per window start (no copy; incomplete trailing window is cut)
+            windows = sliding_window_view(signal, window_size, axis=0)[::step]
+
+            # 6. Compute every window's features at once. Energy is a per-window dot
+            #    product (no squared temporary); RMS is derived from it.
+            energy_vec = np.einsum('wcn,wcn->cw', windows, windows)
+            rms_vec = np.sqrt(energy_vec * (1.0 / window_size))
+            mav_vec = np.abs(windows).mean(axis=2).T
+
+        n_windows = rms_vec.shape[1]
+        if single_channel:
+            energy_vec, rms_vec, mav_vec = energy_vec[0], rms_vec[0], mav_vec[0]
+
+        # 7. Center time of each window.
+        times = (np.arange(n_windows) * step + window_size / 2) / self.sampling_rate
 
         return (
             times, 
@@ -1,5 +1,6 @@
-from scipy.signal import butter, lfilter, iirnotch
+from scipy.signal import butter, sosfiltfilt, iirnotch, tf2sos
 import numpy as np
+import pandas as pd
 
 
 class DataFilter:
@@ -10,32 +11,21 @@ class DataFilter:
         self.notch_freq = notch_freq
         self.quality_factor = quality_factor
 
-    def butter_bandpass(self, lowcut, highcut, fs, order=5):
-        nyq = 0.5 * fs
-        low = lowcut / nyq
-        high = highcut / nyq
-        b, a = butter(order, [low, high], btype='band')
-        return b, a
+        # Coefficients depend only on the config, so compute them once.
+        # Bandpass and notch cascaded as one set of second-order sections
+        # (order 5 'ba' is poorly conditioned), applied in a single pass.
+        bp_sos = butter(5, [lowcut, highcut], btype='band', output='sos', fs=fs)
+        notch_sos = tf2sos(*iirnotch(notch_freq / (0.5 * fs), quality_factor))
+        self._sos = np.vstack([bp_sos, notch_sos])
 
-    def bandpass_filter(self, data, lowcut, highcut, fs, order=5):
-        b, a = self.butter_bandpass(lowcut, highcut, fs, order=order)
-        y = lfilter(b, a, data)
-        return y
-
-    def notch_filter(self, data, notch_freq, fs, quality_factor):
-        nyq = 0.5 * fs
-        norm_notch_freq = notch_freq / nyq
-        b, a = iirnotch(norm_notch_freq, quality_factor)
-        y = lfilter(b, a, data)
-        return y
+    def filter_data_np(self, signal: np.ndarray) -> np.ndarray:
+        # Offline, zero-phase filtering of all channels at once along the time axis.
+        # signal is (n_samples, n_channels); Fortran order keeps each channel contiguous.
+        filtered = sosfiltfilt(self._sos, signal, axis=0)
+        # Keep float32 arrays in float32 so the rest of the pipeline stays half-width
+        out_dtype = np.float32 if signal.dtype == np.float32 else np.float64
+        return np.asfortranarray(filtered, dtype=out_dtype)
 
     def filter_data(self, dataframe):
-        filtered_df = dataframe.copy()
-        for column in filtered_df.columns:
-            signal = filtered_df[column].values
-            butter_signal = self.bandpass_filter(signal, self.lowcut, self.highcut, self.fs)
-            notch_signal = self.notch_filter(butter_signal, self.notch_freq, self.fs, self.quality_factor)
-            new_signal = notch_signal
-            filtered_df[column] = new_signal
-        return filtered_df
-    
\ No newline at end of file
+        filtered = self.filter_data_np(np.asfortranarray(dataframe.to_numpy()))
+        return pd.DataFrame(filtered, index=dataframe.index, columns=dataframe.columns, copy=False)
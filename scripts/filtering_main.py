@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+
 from eeg_csv_handler import EEGFileHandling
 from eeg_plotting import BrainPlotter
 from filtering_handler import DataFilter
@@ -39,9 +42,26 @@ loader.load_all_data(
 mi_data = loader.motor_intent[0]  # First motor intent trial
 mim_data = loader.motor_imagery[0]  # First motor imagery trial
 
+# EEG from the Muse is 16-bit digitized, float32 is plenty: cast once here
+# and every later pass (filtering, features) moves half the bytes.
+mi_data = mi_data.astype({c: 'float32' for c in mi_data.columns if c != 'timestamps'})
+mim_data = mim_data.astype({c: 'float32' for c in mim_data.columns if c != 'timestamps'})
+
 print("\nData loaded successfully.")
 print(mi_data.head())  # Example: print first few rows of the first rest eyes open trial
 
+# From here on the pipeline works on (n_samples, n_channels) arrays in Fortran
+# order (each channel contiguous for the filters); DataFrames are only built
+# for plotting.
+mi_channels = [c for c in mi_data.columns if c != 'timestamps']
+mi_arr = np.asfortranarray(mi_data[mi_channels].to_numpy())
+
+
+def as_frame(arr, channels):
+    """Wrap a pipeline array as a DataFrame for plotting (no copy)."""
+    return pd.DataFrame(arr, columns=channels, copy=False)
+
+
 # STEP 2: Example of plotting using BrainPlotter clas
 
 mi_plotter = BrainPlotter(mi_data)
@@ -60,11 +80,11 @@ mi_filter = DataFilter(
 )
 
 # CREATE NEW FILTERED "DATA OBJECT"
-mi_data_filtered = mi_filter.filter_data(mi_data)
+mi_data_filtered = mi_filter.filter_data_np(mi_arr)
 
 # Create a plotter for filtered data and work independently
 
-mi_data_filtered_plotter = BrainPlotter(mi_data_filtered) 
+mi_data_filtered_plotter = BrainPlotter(as_frame(mi_data_filtered, mi_channels))
 
 mi_data_filtered_plotter.plot_multiple_channels(
     channels=["AF7", "TP9"],
@@ -74,12 +94,12 @@ mi_data_filtered_plotter.plot_multiple_channels(
 # Step 4: Frequency segmentation
 mi_freq_seg = FrequencyHandler()
 
-mi_mu_df = mi_freq_seg.freq_extraction(mi_data_filtered, "mu")
-mi_beta_df = mi_freq_seg.freq_extraction(mi_data_filtered, "beta")
+mi_mu = mi_freq_seg.freq_extraction_np(mi_data_filtered, "mu")
+mi_beta = mi_freq_seg.freq_extraction_np(mi_data_filtered, "beta")
 
 # and plot new data.
-mi_mu_plotter = BrainPlotter(mi_mu_df)
-mi_beta_plotter = BrainPlotter(mi_beta_df)
+mi_mu_plotter = BrainPlotter(as_frame(mi_mu, mi_channels))
+mi_beta_plotter = BrainPlotter(as_frame(mi_beta, mi_channels))
 mi_mu_plotter.plot_multiple_channels(
     channels=["AF7", "TP9"],
     seconds= 10,
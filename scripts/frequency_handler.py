@@ -1,4 +1,17 @@
 import mne, numpy as np, scipy.signal as signal, pandas as pd
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def _design_bandpass(lowcut: float, highcut: float, sfreq: float, order: int) -> np.ndarray:
+    """
+        Butterworth bandpass as SOS, designed once per (band, sfreq, order).
+        The same array is shared across calls, so it is returned read-only.
+    """
+    nyquist = 0.5 * sfreq
+    sos = signal.butter(order, [lowcut / nyquist, highcut / nyquist], btype='band', output='sos')
+    sos.setflags(write=False)
+    return sos
 
 
 class FrequencyHandler:
@@ -25,41 +38,48 @@ class FrequencyHandler:
         self.bfilt_order = bfilt_order
         self.nyquist = 0.5 * sfreq
     
-    def freqseg_bandpass(self, lowcut: float, highcut:float) -> tuple[np.ndarray, np.ndarray]:
+    def freqseg_sos(self, lowcut: float, highcut: float) -> np.ndarray:
         """
-            Creates a specific Bandpass filter for frequency segmentation.
+            Creates a specific Bandpass filter for frequency segmentation,
+            as second-order sections (n_sections, 6). SOS stays numerically
+            stable where the order-10 'ba' polynomial does not.
+            The returned array is the cached, read-only design.
         """
-        low = lowcut / self.nyquist
-        high = highcut / self.nyquist
-        b, a = signal.butter(self.bfilt_order, [low, high], btype='band')
-        return b, a
+        return _design_bandpass(float(lowcut), float(highcut), float(self.sfreq), int(self.bfilt_order))
 
-    def apply_bandpass(self, data: np.ndarray, lowcut: float, highcut: float) -> np.ndarray:
+    def apply_bandpass(self, data: np.ndarray, lowcut: float, highcut: float, axis: int = -1) -> np.ndarray:
         """
-            Applies the bandpass filter to the data.
+            Applies the bandpass filter to the data along `axis`.
         """
-        b, a = self.freqseg_bandpass(lowcut, highcut)
-        y = signal.lfilter(b, a, data)
+        # scipy's sosfilt needs a writable buffer; copying the (n, 6) array is
+        # still far cheaper than redesigning the filter
+        sos = self.freqseg_sos(lowcut, highcut).copy()
+        y = signal.sosfilt(sos, data, axis=axis)
         return y
     
-    def freq_extraction(self, dataframe, band: str) -> pd.DataFrame:
+    def freq_extraction_np(self, data: np.ndarray, band: str) -> np.ndarray:
         """
-            Extracts the desired frequency band from the dataframe.
+            Extracts the desired frequency band from an (n_samples, n_channels)
+            array. Returns a new array, Fortran order, float32 kept as float32.
         """
         if band not in self.F_BANDS:
             raise ValueError(f"Band '{band}' is misspelled. Available bands: {list(self.F_BANDS.keys())}")
         
         lowcut, highcut = self.F_BANDS[band]
-        # create a copy to not mess with filtered data
-        band_df = dataframe.copy()
 
-        # apply bandpass to each column, and replace in dataframe
-        for column in band_df.columns:
-            signal = band_df[column].values
-            bandpassed_signal = self.apply_bandpass(signal, lowcut, highcut)
-            band_df[column] = bandpassed_signal
-        
-        return band_df
+        # apply bandpass to all columns at once (time along axis 0)
+        bandpassed = self.apply_bandpass(data, lowcut, highcut, axis=0)
+        # float32 input stays float32 (see DataFilter.filter_data)
+        out_dtype = np.float32 if data.dtype == np.float32 else np.float64
+        return np.asfortranarray(bandpassed, dtype=out_dtype)
+
+    def freq_extraction(self, dataframe, band: str) -> pd.DataFrame:
+        """
+            Extracts the desired frequency band from the dataframe
+            into a new dataframe, so the filtered data is not touched.
+        """
+        bandpassed = self.freq_extraction_np(np.asfortranarray(dataframe.to_numpy()), band)
+        return pd.DataFrame(bandpassed, index=dataframe.index, columns=dataframe.columns, copy=False)
     
     def extract_mult_bands(self, dataframe, bands: list) -> dict:
         """
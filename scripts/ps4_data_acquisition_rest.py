@@ -1,15 +1,27 @@
 import sys
 import time
 import json
+import queue
 import atexit
 import threading
 import subprocess
-from collections import deque
 from pathlib import Path
 from dataclasses import dataclass
 
 import numpy as np
-from pylsl import StreamInlet, resolve_streams
+from pylsl import StreamInlet, resolve_byprop, resolve_bypred, proc_ALL
+from scipy.signal import butter
+
+from dsp_numba import make_sos_state, sosfilt_nb, warmup_sosfilt
+
+# Stream continuo en Arrow IPC (opcional; sin pyarrow se guarda en CSV)
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+    print("⚠️  pyarrow no disponible, el stream continuo se guardará en CSV. Instalar con: pip install pyarrow")
 
 import pygame
 import dearpygui.dearpygui as dpg
@@ -34,6 +46,10 @@ EVENT_POST_S = 0.85
 
 # Autosave continuo: cada cuánto flush a disco
 FLUSH_EVERY_S = 1.0
+# El hilo de escritura junta hasta WRITE_BATCH_MAX chunks por escritura
+WRITE_BATCH_MAX = 32
+# Buffer del CSV continuo: los write() al SO salen solo en el flush periódico
+WRITE_BUFFER_BYTES = 1 << 20
 
 # Dataset root
 DATA_DIR = Path("./eeg_rest_datasets")
@@ -53,9 +69,33 @@ LABEL_MAP = {
     BTN_CROSS: "REST_i",
 }
 
+LABELS = ["REST_i", "UP_i", "LEFT_i", "RIGHT_i"]
+LABEL_IDX = {name: i for i, name in enumerate(LABELS)}
+
+if ARROW_AVAILABLE:
+    ARROW_LABELS = pa.array(LABELS, type=pa.string())
+    STREAM_SCHEMA = pa.schema(
+        [("t_lsl", pa.float64()), ("label", pa.dictionary(pa.int8(), pa.string()))]
+        + [(name, pa.float32()) for name in CHANNEL_NAMES]
+    )
+
 # UI refresh
 UI_FPS = 30
 PLOT_WINDOW_S = 5.0  # ventana visible del plot
+PLOT_POINTS = 512    # máx. puntos enviados al plot (el widget mide ~1000 px)
+
+# Filtro en vivo (solo para el plot; a disco se guarda la señal cruda)
+LIVE_FILTER_BAND = (1.0, 50.0)
+LIVE_FILTER_ORDER = 4
+
+# dtypes del ring/stream: tiempo LSL en float64 (precisión de reloj), muestras
+# EEG en float32 (de sobra para el ADC del Muse, la mitad de bytes)
+T_DTYPE = np.float64
+SAMPLE_DTYPE = np.float32
+
+# Formato CSV de una muestra (t_lsl + canales) para np.savetxt; los campos
+# constantes del chunk/evento (label, event_id) se anteponen como texto fijo
+SAMPLE_FMT = ",".join(["%.6f"] * (1 + N_CH_EXPECTED))
 
 # =========================
 # Helpers
@@ -67,15 +107,19 @@ def safe_mkdir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
 def resolve_eeg_inlet(timeout_s=STREAM_SEARCH_TIMEOUT_S) -> StreamInlet:
-    t0 = time.time()
-    while time.time() - t0 < timeout_s:
-        streams = resolve_streams(wait_time=2)
-        for s in streams:
-            stype = (s.type() or "").lower()
-            sname = (s.name() or "").lower()
-            if (stype == "eeg") or ("eeg" in stype) or ("/muse/eeg" in sname) or (("muse" in sname) and ("eeg" in sname)):
-                return StreamInlet(s, max_buflen=60)
-    raise RuntimeError("No se encontró stream LSL EEG.")
+    # liblsl filtra por propiedad y regresa apenas aparece el stream
+    streams = resolve_byprop("type", "EEG", timeout=timeout_s)
+    if not streams:
+        # fallback: streams Muse cuyo type/name no es exactamente "EEG"
+        streams = resolve_bypred(
+            "contains(type,'EEG') or contains(type,'eeg') or "
+            "(contains(name,'Muse') and contains(name,'EEG'))",
+            timeout=2,
+        )
+    if not streams:
+        raise RuntimeError("No se encontró stream LSL EEG.")
+    # proc_ALL: clocksync + dejitter + monotonize de timestamps dentro de liblsl
+    return StreamInlet(streams[0], max_buflen=60, processing_flags=proc_ALL)
 
 # =========================
 # MuseLSL process manager
@@ -135,11 +179,37 @@ class EEGRecorder:
         self.fs: float = 256.0
         self.n_ch: int = N_CH_EXPECTED
 
-        # ring buffer
-        self.t_lsl = deque()
-        self.y = [deque() for _ in range(N_CH_EXPECTED)]
-
-        self.buffer_lock = threading.Lock()
+        # ring buffer (SoA circular espejado, se dimensiona en connect()):
+        # cada muestra se escribe en i y en i + maxlen, así las últimas k muestras
+        # son siempre un slice contiguo (vista, sin copia).
+        # Sin lock: un solo productor (_acq_loop) publica _cursor después de
+        # escribir; los lectores leen el cursor una vez y luego el slice.
+        self._maxlen = 0
+        self._buf_t = np.zeros(0, dtype=T_DTYPE)                        # t_lsl
+        self._buf_y = np.zeros((0, N_CH_EXPECTED), dtype=SAMPLE_DTYPE)   # señal cruda
+        self._buf_yf = np.zeros((0, N_CH_EXPECTED), dtype=SAMPLE_DTYPE)  # filtrada para el plot
+        self._cursor = 0  # muestras escritas en total (monotónico, sin módulo)
+        self._n_plot = 0  # muestras en PLOT_WINDOW_S
+        self._n_event = 0  # muestras que puede abarcar la ventana de un evento
+        self._event_scratch = np.zeros((0, 1 + N_CH_EXPECTED), dtype=T_DTYPE)  # t_lsl + canales, reutilizado
+        # plot decimado a PLOT_POINTS: buffers float64 contiguos reutilizados
+        # (DearPyGui los lee por buffer protocol)
+        self._plot_stride = 1
+        self._plot_offsets = np.zeros(PLOT_POINTS, dtype=np.int64)  # offsets desde la muestra más nueva
+        self._plot_pos = np.zeros(PLOT_POINTS, dtype=np.int64)
+        self._plot_t = np.zeros(PLOT_POINTS, dtype=np.float64)
+        self._plot_y = np.zeros(PLOT_POINTS, dtype=np.float64)
+        self._plot_ys = np.zeros(PLOT_POINTS, dtype=SAMPLE_DTYPE)  # gather en dtype del ring
+
+        # live filter (SOS + estado persistente entre chunks), se diseña en connect()
+        self._filter_sos = None
+        self._filter_state = None
+
+        # buffers de pull_chunk reutilizables, se reservan en connect()
+        self._max_pull = 512
+        self._pull_dest = None  # (max_pull, n_ch) SAMPLE_DTYPE, destino de pull_chunk
+        self._pull_ts = None    # (max_pull,) T_DTYPE
+        self._filt_out = None   # (max_pull, N_CH_EXPECTED) SAMPLE_DTYPE, salida del filtro
 
         # runtime state
         self.is_running = False
@@ -147,8 +217,12 @@ class EEGRecorder:
         self.session_id = None
         self.session_dir: Path | None = None
 
-        self.cont_files = {}   # channel -> file handle
-        self.cont_paths = {}   # channel -> path
+        self.stream_file = None  # stream.arrow o labeled_stream.csv abierto
+        self.stream_writer = None  # writer Arrow IPC sobre stream_file
+        self.stream_path: Path | None = None
+        # escritura a disco fuera del hilo de adquisición
+        self._write_q: queue.Queue = queue.Queue()
+        self._writer_thread: threading.Thread | None = None
         self.events_path: Path | None = None
         self.markers_path: Path | None = None
         self.meta_path: Path | None = None
@@ -169,10 +243,10 @@ class EEGRecorder:
     def trigger_gesture_window(self, label: str):
         if not self.is_recording:
             return
-        with self.buffer_lock:
-            if len(self.t_lsl) < 2:
-                return
-            t_now = float(self.t_lsl[-1])  # tiempo LSL más reciente
+        cursor = self._cursor
+        if self._maxlen == 0 or cursor < 2:
+            return
+        t_now = self._buf_t[(cursor - 1) % self._maxlen]  # tiempo LSL más reciente
 
         with self.label_lock:
             self.current_label = label
@@ -189,17 +263,37 @@ class EEGRecorder:
         self.fs = fs
         self.n_ch = n_ch
 
+        # pylsl copia cada chunk directo en _pull_dest (sin listas por chunk)
+        self._max_pull = max(512, int(fs // 10))
+        self._pull_dest = np.empty((self._max_pull, n_ch), dtype=SAMPLE_DTYPE)
+        self._pull_ts = np.empty(self._max_pull, dtype=T_DTYPE)
+        self._filt_out = np.empty((self._max_pull, N_CH_EXPECTED), dtype=SAMPLE_DTYPE)
+
+        # live filter: diseñar, reservar estado y compilar antes del primer chunk
+        self._filter_sos = butter(
+            LIVE_FILTER_ORDER, LIVE_FILTER_BAND, btype="band", output="sos", fs=fs
+        )
+        self._filter_state = make_sos_state(self._filter_sos, N_CH_EXPECTED)
+        # misma vista de columnas que recibe _acq_loop (no contigua si n_ch > 4)
+        warmup_sosfilt(self._filter_sos, self._pull_dest[:, :N_CH_EXPECTED], self._filt_out)
+
         # size ring buffer
         maxlen = int(RING_BUFFER_SECONDS * self.fs)
 
-        with self.buffer_lock:
-            self.t_lsl = deque(maxlen=maxlen)
-            self.y = [deque(maxlen=maxlen) for _ in range(N_CH_EXPECTED)]
-            # prefill deques to avoid empty plot
-            for _ in range(int(self.fs * 1.0)):
-                self.t_lsl.append(0.0)
-                for ch in range(N_CH_EXPECTED):
-                    self.y[ch].append(0.0)
+        # readers see _maxlen == 0 (empty ring) until everything is allocated
+        self._maxlen = 0
+        self._buf_t = np.zeros(2 * maxlen, dtype=T_DTYPE)
+        self._buf_y = np.zeros((2 * maxlen, N_CH_EXPECTED), dtype=SAMPLE_DTYPE)
+        self._buf_yf = np.zeros((2 * maxlen, N_CH_EXPECTED), dtype=SAMPLE_DTYPE)
+        self._n_plot = min(maxlen, int(PLOT_WINDOW_S * self.fs))
+        self._plot_stride = max(1, -(-self._n_plot // PLOT_POINTS))
+        self._plot_offsets[:] = np.arange(PLOT_POINTS - 1, -1, -1) * self._plot_stride
+        self._n_event = min(maxlen // 2, int((EVENT_PRE_S + EVENT_POST_S) * self.fs) + 1)
+        self._event_scratch = np.empty((self._n_event, 1 + N_CH_EXPECTED), dtype=T_DTYPE)
+        # ring vacío: _ring_slice recorta a min(n, cursor), así el plot nunca
+        # mezcla timestamps en cero con tiempos LSL reales
+        self._cursor = 0
+        self._maxlen = maxlen
 
         return fs, n_ch
 
@@ -215,33 +309,38 @@ class EEGRecorder:
         # Pull chunks continuously
         while self.is_running:
             try:
-                chunk, ts = self.inlet.pull_chunk(timeout=1, max_samples=max(512, int(self.fs // 10)))
+                _, ts_list = self.inlet.pull_chunk(
+                    timeout=1, max_samples=self._max_pull, dest_obj=self._pull_dest
+                )
             except Exception:
                 self.dropouts += 1
                 continue
 
-            if ts and chunk:
-                chunk = np.asarray(chunk, dtype=np.float32)
-                ts = np.asarray(ts, dtype=np.float64)
+            if ts_list:
+                n = len(ts_list)
+                # views into the preallocated buffers (valid until the next pull)
+                chunk = self._pull_dest[:n]
+                ts = self._pull_ts[:n]
+                ts[:] = ts_list
                 # safety: ensure we have at least 4 channels
                 if chunk.shape[1] < N_CH_EXPECTED:
                     # count dropout-like
                     self.dropouts += 1
                     continue
 
-                with self.buffer_lock:
-                    for k in range(len(ts)):
-                        self.t_lsl.append(float(ts[k]))
-                        for ch in range(N_CH_EXPECTED):
-                            self.y[ch].append(float(chunk[k, ch]))
+                # filtro en vivo con estado persistente (para el plot)
+                filt = sosfilt_nb(
+                    self._filter_sos, chunk[:, :N_CH_EXPECTED], self._filter_state, out=self._filt_out[:n]
+                )
+
+                self._ring_write(ts, chunk[:, :N_CH_EXPECTED], filt)
 
                 self.samples_total += len(ts)
 
                 # Auto-return a REST_i cuando expire la ventana del gesto
                 with self.label_lock:
                     if self.label_until_lsl is not None:
-                        t_now = float(ts[-1])
-                        if t_now >= self.label_until_lsl:
+                        if ts[-1] >= self.label_until_lsl:
                             self.current_label = "REST_i"
                             self.label_until_lsl = None
 
@@ -254,28 +353,55 @@ class EEGRecorder:
                 # no data
                 pass
 
+    def _ring_write(self, ts: np.ndarray, y: np.ndarray, yf: np.ndarray):
+        # copy a chunk into both halves of the mirrored buffers (producer thread only)
+        # slice copies only (at most two runs per half when the chunk wraps)
+        maxlen = self._maxlen
+        n = min(len(ts), maxlen)
+        pos = self._cursor % maxlen
+        first = min(n, maxlen - pos)
+        for buf, src in ((self._buf_t, ts), (self._buf_y, y), (self._buf_yf, yf)):
+            src = src[len(ts) - n:]
+            buf[pos:pos + first] = src[:first]
+            buf[pos + maxlen:pos + maxlen + first] = src[:first]
+            if first < n:
+                buf[:n - first] = src[first:]
+                buf[maxlen:maxlen + n - first] = src[first:]
+        # el cursor se publica después de escribir (lectores sin lock ven datos completos)
+        self._cursor += n
+
+    def _ring_slice(self, n: int, cursor: int | None = None) -> slice:
+        # contiguous slice of the last n valid samples, oldest first. Safe to read
+        # without a lock while n <= maxlen - max_pull: the producer's next chunk
+        # lands outside it.
+        if cursor is None:
+            cursor = self._cursor
+        n = min(n, cursor, self._maxlen)
+        stop = cursor % self._maxlen + self._maxlen
+        return slice(stop - n, stop)
+
     def _open_session_files(self):
         
         safe_mkdir(DATA_DIR)
         self.session_id = f"REST_{now_str()}"
         self.session_dir = DATA_DIR / self.session_id
         safe_mkdir(self.session_dir)
-        self.labeled_stream_path = self.session_dir / "labeled_stream.csv"
-        if not self.labeled_stream_path.exists():
-            with open(self.labeled_stream_path, "w", encoding="utf-8") as f:
-                f.write("label,t_lsl,TP9,AF7,AF8,TP10\n")
-
-        # Continuous per-channel CSV: t_lsl,value
-        self.cont_files = {}
-        self.cont_paths = {}
-        for idx, name in enumerate(CHANNEL_NAMES):
-            p = self.session_dir / f"continuous_{name}.csv"
-            f = open(p, "a", encoding="utf-8")
-            if p.stat().st_size == 0:
-                f.write("t_lsl,value\n")
-                f.flush()
-            self.cont_files[idx] = f
-            self.cont_paths[idx] = p
+
+        if ARROW_AVAILABLE:
+            # Continuous labeled stream, columnar: t_lsl,label,TP9,AF7,AF8,TP10.
+            # IPC stream (no footer): si el proceso muere, lo ya flusheado se lee igual
+            self.stream_path = self.session_dir / "stream.arrow"
+            self.stream_file = open(self.stream_path, "wb", buffering=WRITE_BUFFER_BYTES)
+            self.stream_writer = pa.ipc.new_stream(self.stream_file, STREAM_SCHEMA)
+        else:
+            # Un solo CSV ancho (label,t_lsl,TP9,AF7,AF8,TP10): todos los canales
+            # comparten la columna de tiempo, se escribe una vez por muestra
+            self.labeled_stream_path = self.session_dir / "labeled_stream.csv"
+            self.stream_file = open(
+                self.labeled_stream_path, "a", encoding="utf-8", buffering=WRITE_BUFFER_BYTES
+            )
+            if self.labeled_stream_path.stat().st_size == 0:
+                self.stream_file.write("label,t_lsl," + ",".join(CHANNEL_NAMES) + "\n")
 
         # Events CSV (one row per sample, includes label + event_id)
         self.events_path = self.session_dir / "events_samples.csv"
@@ -300,6 +426,7 @@ class EEGRecorder:
             "event_window_pre_s": EVENT_PRE_S,
             "event_window_post_s": EVENT_POST_S,
             "ring_buffer_seconds": RING_BUFFER_SECONDS,
+            "stream_file": self.stream_path.name if ARROW_AVAILABLE else "labeled_stream.csv",
         }
         with open(self.meta_path, "w", encoding="utf-8") as f:
             json.dump(meta, f, indent=2)
@@ -308,22 +435,36 @@ class EEGRecorder:
         if self.is_recording:
             return
         self._open_session_files()
-        self.is_recording = True
         self.last_flush_time = time.time()
+        self._write_q = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        self.is_recording = True
 
     def stop_recording(self):
         if not self.is_recording:
             return
         self.is_recording = False
+        # vaciar la cola de escritura antes de cerrar: el hilo termina en cuanto
+        # ve el sentinel (sus errores de escritura se reportan, no lo tumban), y
+        # cerrar los archivos mientras sigue escribiendo los corrompería
+        if self._writer_thread is not None:
+            self._write_q.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
         # close files
-        for f in self.cont_files.values():
+        if self.stream_writer is not None:
             try:
-                f.flush()
-                f.close()
+                self.stream_writer.close()
             except Exception:
                 pass
-        self.cont_files = {}
-        self.cont_paths = {}
+            self.stream_writer = None
+        if self.stream_file is not None:
+            try:
+                self.stream_file.close()
+            except Exception:
+                pass
+            self.stream_file = None
 
         # Update meta with stats
         if self.meta_path:
@@ -346,32 +487,66 @@ class EEGRecorder:
         self.stop_recording()
 
     def _continuous_write(self, ts: np.ndarray, data_4ch: np.ndarray):
-        # write per channel; flush periodically
-        for i in range(len(ts)):
-            t = float(ts[i])
-            for ch in range(N_CH_EXPECTED):
-                f = self.cont_files.get(ch)
-                if f is not None:
-                    f.write(f"{t:.6f},{float(data_4ch[i, ch]):.6f}\n")
-        # Continuous labeled stream (REST por defecto + ventanas de gesto)
+        # solo encola: el hilo de escritura hace el I/O (ts/data son vistas de los buffers de pull)
+        if not self.is_recording:
+            return  # stop_recording ya mandó el sentinel
         with self.label_lock:
             label = self.current_label
+        self._write_q.put((ts.copy(), data_4ch.copy(), LABEL_IDX[label]))
 
-        with open(self.labeled_stream_path, "a", encoding="utf-8") as f:
-            for i in range(len(ts)):
-                f.write(
-                    f"{label},{float(ts[i]):.6f},"
-                    f"{float(data_4ch[i,0]):.6f},{float(data_4ch[i,1]):.6f},"
-                    f"{float(data_4ch[i,2]):.6f},{float(data_4ch[i,3]):.6f}\n"
-                )
+    def _writer_loop(self):
+        # junta los chunks pendientes y los escribe en una sola pasada; None = fin
+        done = False
+        while not done:
+            try:
+                items = [self._write_q.get(timeout=FLUSH_EVERY_S)]
+            except queue.Empty:
+                items = []
+            while items and len(items) < WRITE_BATCH_MAX:
+                try:
+                    items.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                # un chunk pudo colarse detrás del sentinel: se escribe igual
+                items = [it for it in items if it is not None]
+                done = True
+            if items:
+                try:
+                    self._write_chunks(items)
+                except Exception as e:
+                    print(f"⚠️  Error escribiendo stream continuo: {e}")
+            self._periodic_flush()
+
+    def _write_chunks(self, items):
+        ts = np.concatenate([it[0] for it in items])
+        data_4ch = np.concatenate([it[1] for it in items])
+        codes = np.repeat(
+            np.array([it[2] for it in items], dtype=np.int8), [len(it[0]) for it in items]
+        )
 
+        if self.stream_writer is not None:
+            # Arrow batch por tanda; el label va como código int8 de diccionario
+            columns = [pa.array(ts), pa.DictionaryArray.from_arrays(pa.array(codes), ARROW_LABELS)]
+            columns += [pa.array(data_4ch[:, ch]) for ch in range(N_CH_EXPECTED)]
+            self.stream_writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=STREAM_SCHEMA))
+            return
 
+        # CSV fallback: continuous labeled stream (REST por defecto + ventanas de gesto)
+        # el label va fijo en el formato: una llamada por chunk
+        for t_chunk, y_chunk, code in items:
+            np.savetxt(
+                self.stream_file, np.column_stack((t_chunk, y_chunk)),
+                fmt=f"{LABELS[code]},{SAMPLE_FMT}",
+            )
+
+    def _periodic_flush(self):
         now = time.time()
         if now - self.last_flush_time >= FLUSH_EVERY_S:
             self.last_flush_time = now
-            for f in self.cont_files.values():
+            if self.stream_file is not None:
                 try:
-                    f.flush()
+                    self.stream_file.flush()
                 except Exception:
                     pass
 
@@ -386,68 +561,70 @@ class EEGRecorder:
             return
 
         # get t_event from last sample in buffer
-        with self.buffer_lock:
-            if len(self.t_lsl) < 5:
-                return
-            t_event = float(self.t_lsl[-1])
-            t0 = t_event - EVENT_PRE_S
-            t1 = t_event + EVENT_POST_S
-
-            # extract window indices from ring buffer
-            t_arr = np.asarray(self.t_lsl, dtype=np.float64)
-            # indices within [t0, t1]
-            mask = (t_arr >= t0) & (t_arr <= t1)
-            if not np.any(mask):
-                return
+        cursor = self._cursor
+        if self._maxlen == 0 or cursor < 5:
+            return
+        sl = self._ring_slice(self._n_event, cursor)
+        t_arr = self._buf_t[sl]
+        t_event = t_arr[-1]
+        t0 = t_event - EVENT_PRE_S
+        t1 = t_event + EVENT_POST_S
+
+        # t_lsl es monótono: [t0, t1] es un rango contiguo
+        i0 = int(np.searchsorted(t_arr, t0, side="left"))
+        i1 = int(np.searchsorted(t_arr, t1, side="right"))
+        if i1 <= i0:
+            return
 
-            idxs = np.where(mask)[0]
-            # extract per channel
-            y_arr = [np.asarray(self.y[ch], dtype=np.float32) for ch in range(N_CH_EXPECTED)]
+        # ventana en el scratch preasignado (sin column_stack por evento)
+        window = self._event_scratch[:i1 - i0]
+        window[:, 0] = t_arr[i0:i1]
+        window[:, 1:] = self._buf_y[sl.start + i0:sl.start + i1]
 
         # Write samples to events_samples.csv
         self.event_id += 1
         eid = self.event_id
 
         with open(self.events_path, "a", encoding="utf-8") as f:
-            for j in idxs:
-                row = [
-                    str(eid),
-                    label,
-                    f"{t_event:.6f}",
-                    f"{float(t_arr[j]):.6f}",
-                    f"{float(y_arr[0][j]):.6f}",
-                    f"{float(y_arr[1][j]):.6f}",
-                    f"{float(y_arr[2][j]):.6f}",
-                    f"{float(y_arr[3][j]):.6f}",
-                ]
-                f.write(",".join(row) + "\n")
+            np.savetxt(
+                f, window,
+                fmt=f"{eid},{label},{t_event:.6f},{SAMPLE_FMT}",
+            )
 
         # Marker summary
         with open(self.markers_path, "a", encoding="utf-8") as f:
-            f.write(f"{eid},{label},{t_event:.6f},{len(idxs)}\n")
+            f.write(f"{eid},{label},{t_event:.6f},{len(window)}\n")
 
         # counters
         if label in self.event_counts:
             self.event_counts[label] += 1
 
     def get_plot_data(self):
-        # Return last PLOT_WINDOW_S seconds of focus channel
-        with self.buffer_lock:
-            t = np.asarray(self.t_lsl, dtype=np.float64)
-            y = np.asarray(self.y[self.focus_channel], dtype=np.float32)
+        # Return last PLOT_WINDOW_S seconds of focus channel.
+        # Sin lock: se lee el cursor una vez y el slice espejado es una vista; el
+        # escritor tarda RING_BUFFER_SECONDS - PLOT_WINDOW_S en volver a pisarlas.
+        cursor = self._cursor
+        if self._maxlen == 0:
+            return np.array([0.0, 1.0]), np.array([0.0, 0.0])
+        sl = self._ring_slice(self._n_plot, cursor)
+        t = self._buf_t[sl]
+        y = self._buf_yf[sl, self.focus_channel]  # columna: vista con stride
 
-        if len(t) < 5:
+        n = len(t)
+        if n < 5:
             return np.array([0.0, 1.0]), np.array([0.0, 0.0])
 
-        t_end = t[-1]
-        t_start = t_end - PLOT_WINDOW_S
-        m = t >= t_start
-        tt = t[m]
-        yy = y[m]
+        # decimar a PLOT_POINTS (la más nueva siempre incluida) copiando a los
+        # buffers contiguos; válidos hasta la próxima llamada
+        k = min(PLOT_POINTS, (n - 1) // self._plot_stride + 1)
+        pos = self._plot_pos[:k]
+        np.subtract(n - 1, self._plot_offsets[PLOT_POINTS - k:], out=pos)
+        tt = np.take(t, pos, out=self._plot_t[:k])
+        yy = self._plot_y[:k]
+        np.copyto(yy, np.take(y, pos, out=self._plot_ys[:k]))
 
         # convert to relative (0..window)
-        if len(tt) > 0:
-            tt = tt - tt[-1]
+        tt -= t[-1]
         return tt, yy
 
 # =========================
@@ -577,28 +754,30 @@ def run_ui():
         rec.focus_channel = idx
         set_status(f"Canal foco: {name}")
 
+    plot_payload = [None, None]
+    # último estado enviado a cada widget: solo se llama set_value si cambió
+    ui_cache = {"plot": None, "counters": None, "stats": None}
+
     def ui_tick():
-        # Update plot
-        tt, yy = rec.get_plot_data()
-        if dpg.does_item_exist("series"):
-            dpg.set_value("series", [tt.tolist(), yy.tolist()])
+        # Update plot (arrays decimados y contiguos directo a DearPyGui, sin
+        # tolist()), solo si llegaron muestras nuevas o cambió el canal
+        plot_key = (rec._cursor, rec.focus_channel)
+        if plot_key != ui_cache["plot"] and dpg.does_item_exist("series"):
+            ui_cache["plot"] = plot_key
+            plot_payload[0], plot_payload[1] = rec.get_plot_data()
+            dpg.set_value("series", plot_payload)
 
         # Update counters + stats
-        if dpg.does_item_exist("counters"):
-            c = rec.event_counts
-            txt = (
-                f"REST_i: {c['REST_i']}   "
-                f"UP_i: {c['UP_i']}   "
-                f"LEFT_i: {c['LEFT_i']}   "
-                f"RIGHT_i: {c['RIGHT_i']}"
-            )
-            dpg.set_value("counters", txt)
+        c = rec.event_counts
+        counters = (c["REST_i"], c["UP_i"], c["LEFT_i"], c["RIGHT_i"])
+        if counters != ui_cache["counters"] and dpg.does_item_exist("counters"):
+            ui_cache["counters"] = counters
+            dpg.set_value("counters", "   ".join(f"{name}: {n}" for name, n in zip(LABELS, counters)))
 
-        if dpg.does_item_exist("stats"):
-            dpg.set_value(
-                "stats",
-                f"samples: {rec.samples_total}   dropouts: {rec.dropouts}   recording: {rec.is_recording}"
-            )
+        stats = (rec.samples_total, rec.dropouts, rec.is_recording)
+        if stats != ui_cache["stats"] and dpg.does_item_exist("stats"):
+            ui_cache["stats"] = stats
+            dpg.set_value("stats", "samples: %d   dropouts: %d   recording: %s" % stats)
 
     # Build UI
     dpg.create_context()
@@ -618,7 +797,7 @@ def run_ui():
 
     with dpg.window(tag="primary", label="X-Chair • EEG Rest Capture", width=980, height=620):
         dpg.add_text("EEG Rest Capture", color=(230, 230, 230))
-        dpg.add_text("Muse 2 • LSL • PS4 Markers • Autosave por canal", color=(160, 160, 160))
+        dpg.add_text("Muse 2 • LSL • PS4 Markers • Autosave continuo", color=(160, 160, 160))
         dpg.add_spacer(height=8)
 
         with dpg.group(horizontal=True):
@@ -650,7 +829,7 @@ def run_ui():
             with dpg.plot(height=300, width=-1, anti_aliased=True):
                 dpg.add_plot_legend()
                 xaxis = dpg.add_plot_axis(dpg.mvXAxis, label="t (rel)")
-                yaxis = dpg.add_plot_axis(dpg.mvYAxis, label="uV (raw)")
+                yaxis = dpg.add_plot_axis(dpg.mvYAxis, label="uV (1-50 Hz)")
                 dpg.add_line_series([0, 1], [0, 0], label="EEG", parent=yaxis, tag="series")
 
         dpg.add_spacer(height=8)
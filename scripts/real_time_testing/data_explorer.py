@@ -1,41 +1,76 @@
 import sys
 import time
+import importlib
 import subprocess
 import threading
+import traceback
 import atexit
-from collections import deque
 
 import numpy as np
 
 # Set matplotlib backend BEFORE importing pyplot
-# macOS-specific: Try multiple backends in order of preference
+# Backends Agg interactivos primero (los más rápidos con blitting); MacOSX
+# nativo al final porque su blit redibuja de más.
 import matplotlib
-try:
-    # Try Qt5Agg first (usually best for macOS animations)
-    matplotlib.use('Qt5Agg')
-    print("[MATPLOTLIB] Using Qt5Agg backend")
-except:
+for _backend in ("QtAgg", "Qt5Agg", "TkAgg", "MacOSX"):
     try:
-        # Fallback to MacOSX native backend
-        matplotlib.use('MacOSX')
-        print("[MATPLOTLIB] Using MacOSX backend")
-    except:
-        # Last resort: TkAgg
-        matplotlib.use('TkAgg')
-        print("[MATPLOTLIB] Using TkAgg backend")
+        # importar el módulo del backend falla si no está su toolkit
+        importlib.import_module(f"matplotlib.backends.backend_{_backend.lower()}")
+        matplotlib.use(_backend)
+        print(f"[MATPLOTLIB] Using {_backend} backend")
+        break
+    except Exception:
+        continue
+
+# Líneas largas (1280 muestras por canal): descartar vértices sub-píxel,
+# y sin toolbar (evita redibujos extra en idle)
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+matplotlib.rcParams['toolbar'] = 'None'
 
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from pylsl import StreamInlet, resolve_streams
+from pylsl import StreamInlet, resolve_streams, resolve_byprop, resolve_bypred
 
 # --------- CONFIG ----------
 MUSE_MAC = "00:55:da:b7:e7:7c"  # Update with your Muse 2 MAC address
 WAIT_AFTER_START_S = 8
 
 WINDOW_SECONDS = 5
+# Autoescala: como mucho cada RESCALE_EVERY_S, y solo se mueve el ylim si
+# cambia más que YLIM_CHANGE_FRAC del rango (set_ylim invalida el blit)
+RESCALE_EVERY_S = 0.5
+# Periodo del timer de render (ms); sin FuncAnimation, el timer llama update()
+FRAME_INTERVAL_MS = 30
+YLIM_CHANGE_FRAC = 0.10
 CHANNEL_NAMES = ["TP9", "AF7", "AF8", "TP10"]
+
+# LSL inlet: buffer en segundos (int) y tamaño máx. de chunk de transporte
+LSL_MAX_BUFLEN_S = 60
+LSL_MAX_CHUNKLEN = 64
+# Cada pull_chunk drena hasta PULL_MAX_S de muestras (absorbe atrasos de golpe)
+PULL_MAX_S = 0.2
 # --------------------------
 
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, n_bins: int):
+    """
+    Reduce (N,) x / (N, C) y to 2 points per bin (min y, max y), keeping the
+    peaks that plain striding would drop. Returns inputs as-is if N is small.
+    """
+    n = len(x)
+    if n_bins < 1 or n <= 2 * n_bins:
+        return x, y
+    stride = n // n_bins
+    start = n - n_bins * stride  # recortar lo más viejo, no lo más reciente
+    yb = y[start:].reshape(n_bins, stride, y.shape[1])
+    y_out = np.empty((2 * n_bins, y.shape[1]), dtype=y.dtype)
+    y_out[0::2] = yb.min(axis=1)
+    y_out[1::2] = yb.max(axis=1)
+    xb = x[start:].reshape(n_bins, stride)
+    x_out = np.repeat(xb[:, 0], 2)
+    x_out[1::2] = xb[:, -1]
+    return x_out, y_out
+
 muse_proc = None
 
 
@@ -78,22 +113,65 @@ def list_streams():
 
 
 def find_eeg_inlet(timeout=40) -> StreamInlet:
-    t0 = time.time()
-    while time.time() - t0 < timeout:
-        streams = resolve_streams(wait_time=2)
-        for s in streams:
-            stype = (s.type() or "").lower()
-            sname = (s.name() or "").lower()
-
-            # muselsl típicamente publica EEG con type="EEG"
-            if stype == "eeg" or "eeg" in stype or "/muse/eeg" in sname or "muse" in sname and "eeg" in sname:
-                print(f"[LSL] EEG found: name={s.name()} type={s.type()} ch={s.channel_count()} fs={s.nominal_srate()}")
-                return StreamInlet(s, max_buflen=60)
+    # muselsl típicamente publica EEG con type="EEG": liblsl regresa en cuanto
+    # aparece el primero, sin barridos de 2 s
+    streams = resolve_byprop("type", "EEG", timeout=timeout)
+    if not streams:
+        # fallback: type vacío/distinto pero con nombre de stream EEG del Muse
+        # (contains() de XPath distingue mayúsculas)
+        streams = resolve_bypred(
+            "contains(type,'eeg') or contains(type,'EEG') or "
+            "contains(name,'/muse/eeg') or "
+            "(contains(name,'Muse') and contains(name,'EEG'))",
+            timeout=2,
+        )
+    if streams:
+        s = streams[0]
+        print(f"[LSL] EEG found: name={s.name()} type={s.type()} ch={s.channel_count()} fs={s.nominal_srate()}")
+        return StreamInlet(s, max_buflen=LSL_MAX_BUFLEN_S, max_chunklen=LSL_MAX_CHUNKLEN)
 
     list_streams()
     raise RuntimeError("No se encontró stream LSL EEG.")
 
 
+class BlitManager:
+    """
+    Blitting a mano (patrón del tutorial de matplotlib): el fondo (ejes, ticks,
+    grid) se cachea en cada draw_event y por frame solo se redibujan las líneas.
+    """
+
+    def __init__(self, canvas, animated_artists=()):
+        self.canvas = canvas
+        self._bg = None
+        self._artists = []
+        for a in animated_artists:
+            self.add_artist(a)
+        self.cid = canvas.mpl_connect("draw_event", self.on_draw)
+
+    def on_draw(self, event):
+        # redibujo completo (inicio, resize, cambio de ylim): recachear el fondo
+        self._bg = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def add_artist(self, art):
+        art.set_animated(True)
+        self._artists.append(art)
+
+    def _draw_animated(self):
+        fig = self.canvas.figure
+        for a in self._artists:
+            fig.draw_artist(a)
+
+    def update(self):
+        if self._bg is None:
+            self.on_draw(None)
+        else:
+            self.canvas.restore_region(self._bg)
+            self._draw_animated()
+            self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+
 def main():
     start_muse_stream()
     print(f"[MUSE] muselsl stream started for {MUSE_MAC}, waiting {WAIT_AFTER_START_S}s...")
@@ -109,14 +187,23 @@ def main():
     if n_ch < 4:
         print("[WARN] Menos de 4 canales en el stream. No puedo mapear TP9/AF7/AF8/TP10 bien.")
 
-    buf_len = int(WINDOW_SECONDS * fs)
-    tbuf = deque(maxlen=buf_len)
-    ybufs = [deque(maxlen=buf_len) for _ in range(4)]
+    # Buffers de pull_chunk reservados una vez: pylsl copia cada chunk directo
+    # en chunk_buf (sin list-of-lists ni np.asarray por frame)
+    max_pull = max(16, int(fs * PULL_MAX_S))
+    chunk_buf = np.empty((max_pull, n_ch), dtype=np.float32)
 
-    for i in range(buf_len):
-        tbuf.append(-WINDOW_SECONDS + i / fs)
-        for ch in range(4):
-            ybufs[ch].append(0.0)
+    # Ring buffer SPSC sin lock: capacidad = ventana + un chunk de margen, y
+    # espejado (cada muestra va en i y en i + cap) para que la ventana sea
+    # siempre un slice contiguo. El productor escribe y después publica
+    # `cursor` (muestras totales, monotónico); el render lee el cursor una vez
+    # y copia la ventana, que el próximo chunk nunca pisa.
+    buf_len = int(WINDOW_SECONDS * fs)
+    cap = buf_len + max_pull
+    ybuf = np.zeros((2 * cap, 4), dtype=np.float32)
+    # eje x fijo (segundos relativos a la última muestra, a fs nominal): se
+    # calcula una vez y nunca se reescribe
+    tgrid = (np.arange(buf_len, dtype=np.float64) - (buf_len - 1)) / fs
+    cursor = buf_len  # arranca con la ventana en ceros
 
     fig, axes = plt.subplots(4, 1, sharex=True, figsize=(12, 8))
     fig.suptitle("Muse 2 - EEG en tiempo real (/muse/eeg)")
@@ -126,74 +213,117 @@ def main():
         ax.set_ylabel(CHANNEL_NAMES[i])
         ax.grid(True, alpha=0.3)
         ax.set_ylim(-200, 200)  # Initial y-axis range for EEG (microvolts)
-        line, = ax.plot(list(tbuf), list(ybufs[i]))
+        line, = ax.plot(tgrid, ybuf[:buf_len, i])
         lines.append(line)
     axes[-1].set_xlabel("Tiempo (s)")
-    axes[-1].set_xlim(-WINDOW_SECONDS, 0)  # Initial x-axis range
+    axes[-1].set_xlim(-WINDOW_SECONDS, 0)  # Eje x fijo: se grafica tiempo relativo a la última muestra
+    ylims = np.tile([-200.0, 200.0], (4, 1))  # ylim actual por canal (lo, hi)
+
+    # min/max decimation a 2 puntos por columna de píxel; se recalcula en resize
+    plot_bins = [int(axes[0].bbox.width)]
+
+    def on_resize(_event):
+        plot_bins[0] = int(axes[0].bbox.width)
+
+    fig.canvas.mpl_connect("resize_event", on_resize)
 
-    start_wall = time.time()
     last_print = 0.0
     samples_total = 0
     update_count = 0  # Track how many times update is called
-
-    def update(_frame):
-        nonlocal last_print, samples_total, update_count
+    last_rescale = 0.0
+    acq_error = [None]  # excepción del hilo de adquisición; update() la muestra y para
+
+    def acq_loop():
+        # Hilo productor: jala chunks de LSL y los copia al ring, a su ritmo,
+        # aunque el render de matplotlib se trabe
+        nonlocal samples_total, cursor
+        try:
+            while True:
+                _, ts_list = inlet.pull_chunk(timeout=0.5, max_samples=max_pull, dest_obj=chunk_buf)
+                if not ts_list:
+                    continue
+                n = len(ts_list)
+                chunk = chunk_buf[:n]  # (N, n_ch), vista del buffer reservado
+
+                # Primeros 4 canales (Muse EEG típico), copiados en bloque a las dos
+                # mitades del ring (n <= max_pull < cap)
+                y_new = chunk[:, :4]
+                pos = cursor % cap
+                first = min(n, cap - pos)
+                ybuf[pos:pos + first] = y_new[:first]
+                ybuf[pos + cap:pos + cap + first] = y_new[:first]
+                if first < n:
+                    ybuf[:n - first] = y_new[first:]
+                    ybuf[cap:cap + n - first] = y_new[first:]
+                samples_total += n
+                cursor += n  # publicar después de escribir
+        except Exception as e:
+            # sin esto el hilo muere en silencio y el plot se congela
+            print(f"[ERROR] Adquisición LSL detenida: {e!r}")
+            traceback.print_exc()
+            acq_error[0] = e
+
+    def update():
+        nonlocal last_print, update_count, last_rescale
         
         update_count += 1
 
-        chunk, ts = inlet.pull_chunk(timeout=0.0, max_samples=max(16, int(fs // 10)))
-
-        if ts and chunk:
-            chunk = np.asarray(chunk, dtype=np.float32)  # (N, n_ch)
-            ts = np.asarray(ts, dtype=np.float64)
-            samples_total += len(ts)
-
-            rel_now = time.time() - start_wall
-            rel_t = rel_now + (ts - ts[-1])
+        if acq_error[0] is not None:
+            # el productor murió: avisar en la ventana y detener el render
+            timer.stop()
+            fig.suptitle(f"Adquisición detenida: {acq_error[0]!r}", color="red")
+            fig.canvas.draw_idle()
+            return
 
-            # Primeros 4 canales (Muse EEG típico)
-            for k in range(len(ts)):
-                tbuf.append(float(rel_t[k]))
-                for ch in range(4):
-                    ybufs[ch].append(float(chunk[k, ch]))
+        # snapshot de la ventana: leer el cursor una vez y copiar el slice contiguo
+        stop = cursor % cap + cap
+        y_all = ybuf[stop - buf_len:stop].copy()
+        n_total = samples_total
 
         # debug cada ~1s
-        now = time.time()
+        now = time.perf_counter()  # monotónico; única lectura de reloj por frame
         if now - last_print > 1.0:
             last_print = now
-            if samples_total == 0:
+            if n_total == 0:
                 print(f"[DBG] update_count={update_count} | Aún no llegan muestras EEG...")
             else:
-                rng = []
-                for ch in range(4):
-                    y = np.asarray(ybufs[ch], dtype=np.float32)
-                    rng.append((float(np.min(y)), float(np.max(y))))
-                print(f"[DBG] update_count={update_count} | samples_total={samples_total} | ranges={rng} | buffer_len={len(tbuf)}")
-
-        # ALWAYS update plot data, even if no new samples arrived
-        x = np.asarray(tbuf, dtype=np.float64)
-        if len(x) > 2:
-            x_min = x[-1] - WINDOW_SECONDS
-            x_max = x[-1]
-            for ax in axes:
-                ax.set_xlim(x_min, x_max)
+                rng = list(zip(y_all.min(axis=0).tolist(), y_all.max(axis=0).tolist()))
+                print(f"[DBG] update_count={update_count} | samples_total={n_total} | ranges={rng} | buffer_len={buf_len}")
 
+        # ALWAYS update plot data, even if no new samples arrived.
+        # x es el tgrid fijo (el xlim no se mueve; solo se redibujan las líneas)
+        x_plot, y_plot = minmax_decimate(tgrid, y_all, plot_bins[0])
         for i in range(4):
-            y = np.asarray(ybufs[i], dtype=np.float32)
-            lines[i].set_data(x, y)
-
-            if len(y) > 10:
-                lo, hi = np.percentile(y, [5, 95])
-                pad = max(1e-6, (hi - lo) * 0.2)
-                axes[i].set_ylim(lo - pad, hi + pad)
-        
-        return lines
-
-    # CLAVE: guardar referencia a la animación para que NO se destruya
-    print("\n[INFO] Starting animation... Window should appear now.")
-    anim = FuncAnimation(fig, update, interval=30, blit=True, cache_frame_data=False)
-    
+            lines[i].set_data(x_plot, y_plot[:, i])
+
+        if buf_len > 10 and now - last_rescale > RESCALE_EVERY_S:
+            last_rescale = now
+            # un solo percentile para los 4 canales
+            lo, hi = np.percentile(y_all, [5, 95], axis=0)
+            pad = np.maximum(1e-6, (hi - lo) * 0.2)
+            new_lims = np.column_stack((lo - pad, hi + pad))
+            # set_ylim invalida el blit: solo si el rango cambió de verdad
+            span = ylims[:, 1] - ylims[:, 0]
+            changed = np.any(np.abs(new_lims - ylims) > YLIM_CHANGE_FRAC * span[:, None], axis=1)
+            for i in np.flatnonzero(changed):
+                axes[i].set_ylim(new_lims[i, 0], new_lims[i, 1])
+                ylims[i] = new_lims[i]
+            if changed.any():
+                # los ticks cambiaron: redibujo completo (draw_event recachea el fondo)
+                fig.canvas.draw_idle()
+                return
+
+        blit.update()
+
+    threading.Thread(target=acq_loop, daemon=True).start()
+
+    print("\n[INFO] Starting render timer... Window should appear now.")
     plt.tight_layout()
+    # CLAVE: guardar referencia al blit manager y al timer para que NO se destruyan
+    blit = BlitManager(fig.canvas, lines)
+    timer = fig.canvas.new_timer(interval=FRAME_INTERVAL_MS)
+    timer.add_callback(update)
+    timer.start()
     plt.show()  # Simplified - just show the plot
 
 
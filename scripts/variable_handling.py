@@ -1,6 +1,7 @@
 ## Basic Survey for EEG Data Analysis ##
 
 import csv 
+import atexit
 from pathlib import Path
 import time
 
@@ -10,6 +11,12 @@ class CualitativeSurvey:
         self.date_str = time.strftime("%Y%m%d")  # Fecha consistente para toda la sesión
         self.filename = f"new_data/cualitative/cual_survey_{filename}_{self.date_str}.csv"
         self.p_id = p_id
+        # Archivo abierto una sola vez (append) y writer reutilizado en cada guardado
+        self._fh = None
+        self._writer = None
+        # Rows pendientes: se escriben juntas en flush() / close() (también al salir)
+        self._pending = []
+        atexit.register(self.close)
 
     # 2. Define los headers.
     FIELDNAMES = [
@@ -34,13 +41,22 @@ class CualitativeSurvey:
             Si ya existe, pass.
         """
         file_path = Path(self.filename)
-        if not file_path.exists():
-            with open(file_path, mode="w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=self.FIELDNAMES)
-                writer.writeheader()
+        is_new = not file_path.exists()
+        self._open_writer()
+        if is_new:
+            self._writer.writerow(self.FIELDNAMES)
+            self._fh.flush()
         else:
             print(f"Usando archivo existente: {self.filename}")
 
+    def _open_writer(self):
+        """
+            Abre el CSV en modo append (una vez por sesión) y prepara el csv.writer.
+        """
+        if self._fh is None:
+            self._fh = open(self.filename, mode="a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._fh)
+
     def ask_initial_survey(self)-> dict: 
         """
             Realiza la encuesta inicial (previa a la sasión) y devuelve las respuestas 
@@ -93,19 +109,39 @@ class CualitativeSurvey:
 
     def save_survey_response(self, initial_response: dict, final_response: dict = None):
         """
-            Guarda la respuesta de la encuesta en el CSV.
-            Usa DictWriter para escribir el diccionario estilo "lenguaje natural".
+            Agrega la respuesta de la encuesta a las rows pendientes; se escribe
+            al CSV en flush() / close().
+            La row se arma en el orden de FIELDNAMES (campos faltantes quedan vacíos).
+        """
+        if final_response:
+            total_response = {**initial_response, **final_response}
+        else:
+            total_response = initial_response
+        self._pending.append([total_response.get(k, "") for k in self.FIELDNAMES])
+
+    def flush(self):
+        """
+            Escribe todas las rows pendientes al CSV en una sola pasada.
         """
-        with open(self.filename, mode="a", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=self.FIELDNAMES)
-            if final_response:
-                total_response = {**initial_response, **final_response}
-            else:
-                total_response = initial_response
-            writer.writerow(total_response)
+        if not self._pending:
+            return
+        self._open_writer()
+        self._writer.writerows(self._pending)
+        self._fh.flush()
+        self._pending.clear()
         # Debug print st.
         print(f"Survey saved at: {self.filename}")
 
+    def close(self):
+        """
+            Escribe lo pendiente y cierra el CSV (idempotente).
+        """
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self._writer = None
+
 
 
 